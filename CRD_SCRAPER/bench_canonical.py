@@ -0,0 +1,88 @@
+"""
+Throughput and dedupe benchmark for SmilesCanonicalizer.
+
+Takes the reactions in kmt_data_export.json, adds rewritten variants of each
+(components shuffled within their role, every other variant also with atoms
+in random order when RDKit is available) and reports, per canonicalization
+mode, how many distinct dedupe keys remain and how many reactions/second are
+canonicalized with a cold and a warm molecule cache.
+
+    python bench_canonical.py --variants 5 --repeat 20
+"""
+import argparse
+import importlib.util
+import json
+import os
+import random
+import time
+
+from kmt_scraper import KMTScraperPro, SmilesCanonicalizer
+
+
+def load_reactions(path: str):
+    with open(path) as f:
+        return [r["reaction_smiles"] for r in json.load(f)]
+
+
+def rewrite(reaction_smiles: str, parse, rng: random.Random, chem=None) -> str:
+    """Same reaction, different string: shuffled components and, with RDKit, random atom order."""
+    parsed = parse(reaction_smiles)
+    roles = []
+    for role in ("reactants", "reagents", "products"):
+        components = list(parsed[role])
+        rng.shuffle(components)
+        if chem is not None:
+            components = [chem.MolToSmiles(chem.MolFromSmiles(s), doRandom=True) for s in components]
+        roles.append(".".join(components))
+    return ">".join(roles)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark canonical-SMILES dedupe on the KMT export.")
+    parser.add_argument("--export", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "kmt_data_export.json"))
+    parser.add_argument("--variants", type=int, default=5, help="Rewritten copies per reaction (default: 5).")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the reaction list when timing (default: 20).")
+    args = parser.parse_args()
+
+    scraper = KMTScraperPro()
+    parse = scraper._parse_smiles_string
+    has_rdkit = importlib.util.find_spec("rdkit") is not None
+    chem = None
+    if has_rdkit:
+        from rdkit import Chem
+        chem = Chem
+
+    rng = random.Random(0)
+    originals = load_reactions(args.export)
+    reactions = list(originals)
+    for smiles in originals:
+        # Even variants only reorder components; odd ones also randomize atom order (needs RDKit).
+        reactions.extend(rewrite(smiles, parse, rng, chem if v % 2 else None) for v in range(args.variants))
+    parsed = [(smiles, parse(smiles)) for smiles in reactions]
+    print(f"{len(originals)} reactions in export, {len(reactions)} with variants")
+
+    modes = ["none", "sorted"] + (["rdkit"] if has_rdkit else [])
+    for mode in modes:
+        keys = {SmilesCanonicalizer(mode).reaction(smiles, p) for smiles, p in parsed}
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            canonicalizer = SmilesCanonicalizer(mode)
+            for smiles, p in parsed:
+                canonicalizer.reaction(smiles, p)
+        cold = len(parsed) * args.repeat / (time.perf_counter() - start)
+
+        canonicalizer = SmilesCanonicalizer(mode)
+        for smiles, p in parsed:
+            canonicalizer.reaction(smiles, p)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for smiles, p in parsed:
+                canonicalizer.reaction(smiles, p)
+        warm = len(parsed) * args.repeat / (time.perf_counter() - start)
+
+        print(f"{mode:<7} {len(keys):>6} distinct keys   cold {cold:>10,.0f} rxn/s   warm (memo) {warm:>10,.0f} rxn/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark for the KMT page-scanning backends.
+
+Runs every available HTML backend over the same pages and reports pages/sec
+and MB/sec, after checking that each one extracts exactly what the
+BeautifulSoup reference does. Pass saved pages, or let it synthesize
+KMT-style result pages from kmt_data_export.json.
+
+    python bench_html.py --pages saved_pages/*.html
+    python bench_html.py --synthetic 200
+"""
+import argparse
+import glob
+import html
+import importlib.util
+import json
+import os
+import time
+from typing import List
+
+from kmt_scraper import HTML_BACKENDS, KMTScraperPro
+
+
+def synthetic_pages(count: int, rows: int = 10) -> List[str]:
+    """KMT-like result pages: a table of reactions, an inline script, styling and a Next link."""
+    export = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kmt_data_export.json")
+    with open(export) as f:
+        smiles = [r["reaction_smiles"] for r in json.load(f)]
+
+    nav = '<a href="/about">About</a>' * 5
+    pages = []
+    for p in range(count):
+        items = [smiles[(p * rows + k) % len(smiles)] for k in range(rows)]
+        body = "".join(
+            f'<tr class="reaction"><td><div class="rxn" data-reaction-smiles="{html.escape(s)}">'
+            f'<img src="/img/{p}-{k}.svg" alt="reaction"></div></td>'
+            f'<td><p>{"Reported conditions and yield details. " * 20}</p></td></tr>'
+            for k, s in enumerate(items)
+        )
+        script = "var reactions = " + json.dumps([{"smiles": s, "id": k} for k, s in enumerate(items[:3])]) + ";"
+        pages.append(
+            "<!DOCTYPE html><html><head><title>KMT</title>"
+            f"<script>{script}</script><style>.rxn {{ margin: 0 }}</style></head>"
+            f"<body><nav>{nav}</nav><table>{body}</table>"
+            f'<div class="pager"><a href="/data/reaction/doi/x/start/{p * rows}">Prev</a> '
+            f'<a href="/data/reaction/doi/x/start/{(p + 1) * rows}">Next</a></div></body></html>'
+        )
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KMT HTML extraction backends.")
+    parser.add_argument("--pages", nargs="*", default=None, help="Saved HTML pages (files or globs).")
+    parser.add_argument("--synthetic", type=int, default=200, help="Synthetic pages when --pages is not given (default: 200).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes; the best is reported (default: 3).")
+    args = parser.parse_args()
+
+    if args.pages:
+        paths = [path for pattern in args.pages for path in sorted(glob.glob(pattern))]
+        pages = []
+        for path in paths:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append(f.read())
+    else:
+        pages = synthetic_pages(args.synthetic)
+    total_mb = sum(len(p.encode("utf-8")) for p in pages) / 1e6
+    print(f"{len(pages)} pages, {total_mb:.1f} MB")
+
+    backends = [name for name in HTML_BACKENDS if name != "lxml" or importlib.util.find_spec("lxml")]
+    reference = [HTML_BACKENDS["bs4"](page) for page in pages]
+    baseline = None
+    for name in backends:
+        scan = HTML_BACKENDS[name]
+        mismatches = sum(scan(page) != ref for page, ref in zip(pages, reference))
+
+        scraper = KMTScraperPro(html_backend=name)
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for page in pages:
+                scraper._extract_page("bench", page)
+            best = min(best, time.perf_counter() - start)
+
+        baseline = baseline or best
+        print(f"{name:<8} {len(pages) / best:>9,.0f} pages/s  {total_mb / best:>7.1f} MB/s  "
+              f"({baseline / best:.2f}x vs bs4)  mismatches vs bs4: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
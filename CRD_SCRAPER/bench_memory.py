@@ -0,0 +1,106 @@
+"""
+Memory benchmark for ReactionData.
+
+Builds the same reactions (kmt_data_export.json, repeated across synthetic
+pages of 10) in the original representation - a plain dataclass holding
+three lists of freshly split strings and an ISO timestamp - and in the
+current slotted, id-tuple form, and reports retained bytes per reaction
+measured with tracemalloc. The current figure includes the MoleculeTable.
+
+    python bench_memory.py --reactions 100000
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import List
+
+from kmt_scraper import KMTScraperPro, ReactionData
+
+
+@dataclass
+class LegacyReactionData:
+    reaction_smiles: str
+    reactant_smiles: List[str]
+    reagent_smiles: List[str]
+    product_smiles: List[str]
+    source_url: str
+    scraped_at: str
+    extraction_method: str
+
+
+def build_legacy(scraper, smiles_list, urls):
+    reactions = []
+    for i, smiles in enumerate(smiles_list):
+        parsed = scraper._parse_smiles_string(smiles)
+        reactions.append(LegacyReactionData(
+            reaction_smiles=smiles,
+            reactant_smiles=parsed["reactants"],
+            reagent_smiles=parsed["reagents"],
+            product_smiles=parsed["products"],
+            source_url=urls[i // 10],
+            scraped_at=datetime.now().isoformat(),
+            extraction_method="data-attr",
+        ))
+    return reactions
+
+
+def build_compact(scraper, smiles_list, urls):
+    molecules = ReactionData.molecules
+    reactions = []
+    for i, smiles in enumerate(smiles_list):
+        parsed = scraper._parse_smiles_string(smiles)
+        reactions.append(ReactionData(
+            reaction_smiles=smiles,
+            reactant_ids=molecules.intern_all(parsed["reactants"]),
+            reagent_ids=molecules.intern_all(parsed["reagents"]),
+            product_ids=molecules.intern_all(parsed["products"]),
+            source_url=urls[i // 10],
+            scraped_ts=int(time.time()),
+            extraction_method="data-attr",
+        ))
+    return reactions
+
+
+def retained_bytes(build, *args) -> tuple:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(*args)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ReactionData memory per reaction.")
+    parser.add_argument("--reactions", type=int, default=100000, help="Reactions to build (default: 100000).")
+    parser.add_argument("--export", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "kmt_data_export.json"))
+    args = parser.parse_args()
+
+    with open(args.export) as f:
+        source = [r["reaction_smiles"] for r in json.load(f)]
+    # Reaction strings are shared by both forms; only what each representation adds is measured.
+    smiles_list = [source[i % len(source)] for i in range(args.reactions)]
+    urls = [f"{KMTScraperPro.BASE_URL}/data/reaction/doi/10.1021/jacsau.4c01276/start/{p * 10}"
+            for p in range(args.reactions // 10 + 1)]
+    scraper = KMTScraperPro()
+
+    legacy, legacy_bytes = retained_bytes(build_legacy, scraper, smiles_list, urls)
+    compact, compact_bytes = retained_bytes(build_compact, scraper, smiles_list, urls)
+
+    sample_legacy = {k: v for k, v in asdict(legacy[0]).items() if k != "scraped_at"}
+    sample_compact = {k: v for k, v in compact[0].to_dict().items() if k not in ("scraped_at", "canonical_smiles")}
+    assert sample_legacy == sample_compact, "to_dict() must match the original export record"
+
+    n = args.reactions
+    print(f"{n:,} reactions")
+    print(f"dataclass + lists + ISO str: {legacy_bytes / n:>7.0f} bytes/reaction")
+    print(f"slotted + id tuples + int ts: {compact_bytes / n:>7.0f} bytes/reaction  "
+          f"({legacy_bytes / compact_bytes:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
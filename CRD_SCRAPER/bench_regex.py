@@ -0,0 +1,69 @@
+"""
+Pathological-input benchmark for the KMT reaction-SMILES scanner.
+
+Builds pages around long runs of SMILES characters and '>' that never close
+their quote (minified JS, base64 blobs), doubling the size each step. The
+original uncompiled `[...]+>>?[...]+` findall over the whole page backtracks
+quadratically on such runs; the page scan should stay linear, i.e. roughly
+constant time per KB.
+
+    python bench_regex.py --base_kb 4 --steps 5
+"""
+import argparse
+import re
+import time
+
+from kmt_scraper import KMTScraperPro
+
+LEGACY_PATTERN = r"['\"]([A-Za-z0-9\[\]()=#@+\-\\/.>]+>>?[A-Za-z0-9\[\]()=#@+\-\\/.>]+)['\"]"
+
+
+def pathological_page(kb: int) -> str:
+    """An unterminated 'C>C>... script run and '>>>>... attribute run, plus two real reactions."""
+    run = kb * 1024 // 4
+    return (
+        "<html><head><script>var blob = '" + "C>" * run + ";</script></head><body>"
+        f'<div data-reaction-smiles="CCO&gt;&gt;CC=O" title="\'{">" * (run * 2)} end">x</div>'
+        "<script>show('CC(=O)O.OCC>>CC(=O)OCC');</script></body></html>"
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KMT SMILES scanning on pathological pages.")
+    parser.add_argument("--base_kb", type=int, default=4, help="Size of the smallest page in KB (default: 4).")
+    parser.add_argument("--steps", type=int, default=5, help="Number of size doublings (default: 5).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes; the best is reported (default: 3).")
+    parser.add_argument("--legacy_limit_kb", type=int, default=32, help="Skip the legacy scan above this size (default: 32).")
+    args = parser.parse_args()
+
+    scraper = KMTScraperPro()
+    print(f"backend: {scraper.html_backend}")
+    print(f"{'page KB':>8} {'legacy s':>10} {'legacy us/KB':>13} {'scan s':>9} {'scan us/KB':>11}")
+    for step in range(args.steps):
+        kb = args.base_kb * 2 ** step
+        page = pathological_page(kb)
+        size_kb = len(page) / 1024
+
+        reactions, _ = scraper._extract_page("bench", page)
+        assert {r.reaction_smiles for r in reactions} == {"CCO>>CC=O", "CC(=O)O.OCC>>CC(=O)OCC"}
+        scan = timed(lambda: scraper._extract_page("bench", page), args.repeat)
+
+        if kb <= args.legacy_limit_kb:
+            legacy = timed(lambda: re.findall(LEGACY_PATTERN, page), 1)
+            legacy_cols = f"{legacy:>10.3f} {legacy / size_kb * 1e6:>13,.0f}"
+        else:
+            legacy_cols = f"{'skipped':>10} {'':>13}"
+        print(f"{size_kb:>8.0f} {legacy_cols} {scan:>9.4f} {scan / size_kb * 1e6:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
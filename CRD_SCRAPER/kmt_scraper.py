@@ -1,40 +1,761 @@
 import requests
 from bs4 import BeautifulSoup
+import abc
+import argparse
+import csv
+import functools
 import json
 import re
+import sys
+import hashlib
+import importlib.util
+import math
+import os
+import struct
+import sqlite3
 import time
-import random
+import threading
 import pandas as pd
-from dataclasses import dataclass, asdict
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
 from datetime import datetime
+from html.parser import HTMLParser
 
-@dataclass
+class MoleculeTable:
+    """
+    Interns component SMILES: every distinct molecule gets a small integer id,
+    so reactions hold compact id tuples instead of their own strings.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.smiles: List[str] = []
+        self._lock = threading.Lock()
+
+    def intern(self, smiles: str) -> int:
+        molecule_id = self.ids.get(smiles)
+        if molecule_id is None:
+            with self._lock:
+                molecule_id = self.ids.get(smiles)
+                if molecule_id is None:
+                    molecule_id = self.ids[smiles] = len(self.smiles)
+                    self.smiles.append(smiles)
+        return molecule_id
+
+    def intern_all(self, smiles_list: Iterable[str]) -> Tuple[int, ...]:
+        # A tuple of the table's own int objects is smaller than an array for a handful of ids.
+        return tuple(self.intern(smiles) for smiles in smiles_list)
+
+    def lookup(self, ids: Iterable[int]) -> List[str]:
+        return [self.smiles[i] for i in ids]
+
+    def __len__(self):
+        return len(self.smiles)
+
+    def save(self, path: str):
+        """Writes the molecules table (molecule_id, smiles) as CSV."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["molecule_id", "smiles"])
+            writer.writerows(enumerate(self.smiles))
+
+@dataclass(slots=True)
 class ReactionData:
+    """
+    One scraped reaction, kept compact for million-reaction crawls: slots
+    instead of a __dict__, components as tuples of ids into the process-wide
+    `molecules` table, the page URL interned so a page's reactions share one
+    string, and the scrape time as integer epoch seconds. to_dict() gives the
+    export record; dataclasses.asdict() gives the compact one.
+    """
+    molecules: ClassVar[MoleculeTable] = MoleculeTable()
+
     reaction_smiles: str
-    reactant_smiles: List[str]
-    reagent_smiles: List[str]
-    product_smiles: List[str]
+    reactant_ids: Tuple[int, ...]
+    reagent_ids: Tuple[int, ...]
+    product_ids: Tuple[int, ...]
     source_url: str
-    scraped_at: str
+    scraped_ts: int
     extraction_method: str  
+    canonical_smiles: str = ""
+
+    def __post_init__(self):
+        self.source_url = sys.intern(self.source_url)
+
+    @property
+    def scraped_at(self) -> str:
+        return datetime.fromtimestamp(self.scraped_ts).isoformat()
+
+    @property
+    def reactant_smiles(self) -> List[str]:
+        return self.molecules.lookup(self.reactant_ids)
+
+    @property
+    def reagent_smiles(self) -> List[str]:
+        return self.molecules.lookup(self.reagent_ids)
+
+    @property
+    def product_smiles(self) -> List[str]:
+        return self.molecules.lookup(self.product_ids)
+
+    def to_dict(self) -> dict:
+        """The export record, with components spelled out as SMILES lists."""
+        return {
+            "reaction_smiles": self.reaction_smiles,
+            "reactant_smiles": self.reactant_smiles,
+            "reagent_smiles": self.reagent_smiles,
+            "product_smiles": self.product_smiles,
+            "source_url": self.source_url,
+            "scraped_at": self.scraped_at,
+            "extraction_method": self.extraction_method,
+            "canonical_smiles": self.canonical_smiles,
+        }
+
+REACTION_ID_COLUMNS = ["reaction_smiles", "canonical_smiles", "reactant_ids", "reagent_ids", "product_ids",
+                       "source_url", "scraped_at", "extraction_method"]
+
+def reaction_id_row(r: ReactionData) -> list:
+    """A {prefix}_reactions.csv row: component molecule ids space-separated instead of SMILES."""
+    return [r.reaction_smiles, r.canonical_smiles, " ".join(map(str, r.reactant_ids)),
+            " ".join(map(str, r.reagent_ids)), " ".join(map(str, r.product_ids)),
+            r.source_url, r.scraped_at, r.extraction_method]
+
+@dataclass
+class ReactionCandidate:
+    """A reaction found on a page, before dedupe decides whether it is kept (and interned)."""
+    reaction_smiles: str
+    parsed: dict
+    source_url: str
+    scraped_ts: int
+    extraction_method: str
+    canonical_smiles: str
+
+@dataclass
+class PageScan:
+    """What the extractor needs from a page, gathered in one pass by any HTML backend."""
+    attr_smiles: List[str]
+    next_href: Optional[str]
+    scripts: List[str]
+    attr_values: List[str]
+
+NEXT_TEXT = re.compile(r"Next", re.I)
+REACTION_ATTR = "data-reaction-smiles"
+
+# A quoted run of SMILES characters with a '>' somewhere inside it. It matches
+# exactly what ['"]([C>]+>>?[C>]+)['"] does, but the part before the first
+# '>' cannot itself contain '>', so a run splits only one way and a long
+# unterminated run costs linear rather than quadratic time.
+SMILES_CHARS = r"A-Za-z0-9\[\]()=#@+\-\\/."
+QUOTED_REACTION_SMILES = re.compile(
+    r"['\"]([" + SMILES_CHARS + r">][" + SMILES_CHARS + r"]*>[" + SMILES_CHARS + r">]+)['\"]"
+)
+
+def scan_page_bs4(html: str) -> PageScan:
+    """Reference backend: a full BeautifulSoup tree with the pure-Python html.parser."""
+    soup = BeautifulSoup(html, "html.parser")
+    next_link = soup.find("a", string=NEXT_TEXT)
+    attr_values = []
+    for el in soup.find_all(True):
+        for name, value in el.attrs.items():
+            if name != REACTION_ATTR:
+                attr_values.append(" ".join(value) if isinstance(value, list) else value)
+    return PageScan(
+        attr_smiles=[el.get(REACTION_ATTR) for el in soup.find_all(attrs={REACTION_ATTR: True})],
+        next_href=next_link.get("href") if next_link else None,
+        scripts=[script.get_text() for script in soup.find_all("script")],
+        attr_values=attr_values,
+    )
+
+def scan_page_lxml(html: str) -> PageScan:
+    """libxml2's C parser, then a single walk over the element tree."""
+    try:
+        from lxml import etree, html as lxml_html
+    except ImportError:
+        print("ERROR: lxml is not installed. Run 'pip install lxml' to use the lxml HTML backend.", file=sys.stderr)
+        sys.exit(1)
+
+    scan = PageScan([], None, [], [])
+    if not html.strip():
+        return scan
+    found_next = False
+    for el in lxml_html.fromstring(html).iter(etree.Element):
+        for name, value in el.attrib.items():
+            if name == REACTION_ATTR:
+                scan.attr_smiles.append(value)
+            else:
+                scan.attr_values.append(value)
+        if el.tag == "script":
+            scan.scripts.append(el.text or "")
+        elif el.tag == "a" and not found_next and NEXT_TEXT.search(el.text_content()):
+            scan.next_href = el.get("href")
+            found_next = True
+    return scan
+
+class _StreamScanner(HTMLParser):
+    """Tokenizes the page without building a tree, keeping only what PageScan needs."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.scan = PageScan([], None, [], [])
+        self._found_next = False
+        self._link_href = None
+        self._link_text: Optional[List[str]] = None
+        self._script: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name == REACTION_ATTR:
+                self.scan.attr_smiles.append(value)
+            else:
+                self.scan.attr_values.append(value)
+        if tag == "script":
+            self._script = []
+        elif tag == "a" and not self._found_next:
+            self._link_href = dict(attrs).get("href")
+            self._link_text = []
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._script is not None:
+            self.scan.scripts.append("".join(self._script))
+            self._script = None
+        elif tag == "a" and self._link_text is not None:
+            if NEXT_TEXT.search("".join(self._link_text)):
+                self.scan.next_href = self._link_href
+                self._found_next = True
+            self._link_text = None
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script.append(data)
+        elif self._link_text is not None:
+            self._link_text.append(data)
+
+def scan_page_stream(html: str) -> PageScan:
+    """Streaming stdlib tokenizer: no tree and no extra dependency."""
+    scanner = _StreamScanner()
+    scanner.feed(html)
+    scanner.close()
+    return scanner.scan
+
+HTML_BACKENDS = {
+    "bs4": scan_page_bs4,
+    "lxml": scan_page_lxml,
+    "stream": scan_page_stream,
+}
+
+def resolve_html_backend(name: str = "auto") -> str:
+    """"auto" picks lxml when it is installed and the stdlib stream tokenizer otherwise."""
+    if name == "auto":
+        return "lxml" if importlib.util.find_spec("lxml") else "stream"
+    if name not in HTML_BACKENDS:
+        raise ValueError(f"Unknown HTML backend {name!r}; choose from auto, {', '.join(HTML_BACKENDS)}")
+    return name
+
+class SmilesCanonicalizer:
+    """
+    Canonical form of a parsed reaction, used as its dedupe key.
+
+    "rdkit" rewrites every component as RDKit canonical SMILES (unparseable
+    ones are kept as written) and sorts them within each role; "sorted" only
+    sorts the components as written; "none" keeps the reaction string as is.
+    "auto" uses RDKit when it is installed. Molecules are memoized in an LRU
+    cache, since the same reagents and solvents recur across reactions.
+    """
+
+    def __init__(self, mode: str = "auto", cache_size: int = 65536):
+        if mode == "auto":
+            mode = "rdkit" if importlib.util.find_spec("rdkit") else "sorted"
+        if mode not in ("rdkit", "sorted", "none"):
+            raise ValueError(f"Unknown canonicalization {mode!r}; choose from auto, rdkit, sorted, none")
+        self.mode = mode
+        if mode == "rdkit":
+            try:
+                from rdkit import Chem, RDLogger
+            except ImportError:
+                print("ERROR: RDKit is not installed. Run 'pip install rdkit' or use --canonical sorted.", file=sys.stderr)
+                sys.exit(1)
+            RDLogger.DisableLog("rdApp.*")
+            self._chem = Chem
+        self.molecule = functools.lru_cache(maxsize=cache_size)(self._molecule)
+
+    def _molecule(self, smiles: str) -> str:
+        if self.mode != "rdkit":
+            return smiles
+        mol = self._chem.MolFromSmiles(smiles)
+        return self._chem.MolToSmiles(mol) if mol is not None else smiles
+
+    def reaction(self, reaction_smiles: str, parsed: dict) -> str:
+        if self.mode == "none":
+            return reaction_smiles
+        return ">".join(
+            ".".join(sorted(self.molecule(smiles) for smiles in parsed[role]))
+            for role in ("reactants", "reagents", "products")
+        )
+
+# Same schema as ReactionStore in ORD_SCAPER/ord_scraper.py.py, so both scrapers can share one file.
+REACTION_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reactions (
+    reaction_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    dataset_id TEXT,
+    doi TEXT,
+    reaction_smiles TEXT,
+    success INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS components (
+    reaction_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    role TEXT,
+    smiles TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS provenance (
+    reaction_id TEXT NOT NULL,
+    source_url TEXT,
+    extraction_method TEXT,
+    scraped_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reactions_dataset ON reactions (dataset_id);
+CREATE INDEX IF NOT EXISTS reactions_doi ON reactions (doi);
+CREATE INDEX IF NOT EXISTS components_smiles ON components (smiles);
+CREATE INDEX IF NOT EXISTS components_reaction ON components (reaction_id);
+CREATE INDEX IF NOT EXISTS provenance_reaction ON provenance (reaction_id);
+"""
+
+class ReactionStore:
+    """SQLite store of reactions, components and provenance (WAL mode, batched writes)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(REACTION_STORE_SCHEMA)
+
+    @staticmethod
+    def reaction_id(reaction_smiles: str) -> str:
+        """KMT pages carry no ids, so reactions are keyed by a hash of their SMILES."""
+        return "kmt-" + hashlib.sha256(reaction_smiles.encode("utf-8")).hexdigest()[:24]
+
+    def write_reactions(self, reactions: List[ReactionData], doi: str) -> int:
+        """Stores reactions in one transaction; returns how many were not already in the store."""
+        rows, components, provenance = [], [], []
+        for r in reactions:
+            rid = self.reaction_id(r.canonical_smiles or r.reaction_smiles)
+            rows.append((rid, "kmt", None, doi, r.reaction_smiles, None, None))
+            provenance.append((rid, r.source_url, r.extraction_method, r.scraped_at))
+            for role, smiles_list in (("REACTANT", r.reactant_smiles), ("REAGENT", r.reagent_smiles), ("PRODUCT", r.product_smiles)):
+                for smiles in smiles_list:
+                    components.append((rid, role.lower(), role, smiles))
+
+        self.conn.execute("BEGIN")
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany("INSERT OR IGNORE INTO reactions VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            inserted = self.conn.total_changes - before
+            self.conn.executemany("DELETE FROM components WHERE reaction_id = ?", [(row[0],) for row in rows])
+            self.conn.executemany("INSERT INTO components VALUES (?, ?, ?, ?)", components)
+            self.conn.executemany("INSERT INTO provenance VALUES (?, ?, ?, ?)", provenance)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return inserted
+
+    def reactions_with_component(self, smiles: str) -> List[str]:
+        return [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT reaction_id FROM components WHERE smiles = ?", (smiles,)
+        )]
+
+    def close(self):
+        self.conn.close()
+
+class ParquetExport:
+    """
+    Columnar KMT export written in row groups of `batch_size` as reactions
+    arrive, without building a DataFrame:
+
+    {prefix}.parquet             one row per reaction, components as list<string> columns
+    {prefix}_components.parquet  long format: reaction_id, role, position, molecule_id, smiles
+
+    reaction_id matches the ReactionStore key, so the two tables join on it.
+    """
+
+    def __init__(self, prefix: str, batch_size: int = 50000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("ERROR: pyarrow is not installed. Run 'pip install pyarrow' to use --parquet.", file=sys.stderr)
+            sys.exit(1)
+
+        self._pa = pa
+        self.batch_size = batch_size
+        self.count = 0
+        self.paths = (f"{prefix}.parquet", f"{prefix}_components.parquet")
+        smiles_list = pa.list_(pa.string())
+        self._reaction_schema = pa.schema([
+            ("reaction_id", pa.string()),
+            ("reaction_smiles", pa.string()),
+            ("canonical_smiles", pa.string()),
+            ("reactant_smiles", smiles_list),
+            ("reagent_smiles", smiles_list),
+            ("product_smiles", smiles_list),
+            ("source_url", pa.string()),
+            ("scraped_at", pa.timestamp("s")),
+            ("extraction_method", pa.string()),
+        ])
+        self._component_schema = pa.schema([
+            ("reaction_id", pa.string()),
+            ("role", pa.string()),
+            ("position", pa.int16()),
+            ("molecule_id", pa.int64()),
+            ("smiles", pa.string()),
+        ])
+        self._writers = (pq.ParquetWriter(self.paths[0], self._reaction_schema),
+                         pq.ParquetWriter(self.paths[1], self._component_schema))
+        self._pending: List[ReactionData] = []
+
+    def write(self, reactions: Iterable[ReactionData]):
+        self._pending.extend(reactions)
+        while len(self._pending) >= self.batch_size:
+            self._flush(self._pending[:self.batch_size])
+            del self._pending[:self.batch_size]
+
+    def _flush(self, batch: List[ReactionData]):
+        """Writes `batch` as one row group of each table."""
+        if not batch:
+            return
+        reactions = {name: [] for name in self._reaction_schema.names}
+        components = {name: [] for name in self._component_schema.names}
+        for r in batch:
+            reaction_id = ReactionStore.reaction_id(r.canonical_smiles or r.reaction_smiles)
+            reactions["reaction_id"].append(reaction_id)
+            reactions["reaction_smiles"].append(r.reaction_smiles)
+            reactions["canonical_smiles"].append(r.canonical_smiles)
+            reactions["source_url"].append(r.source_url)
+            reactions["scraped_at"].append(r.scraped_ts)
+            reactions["extraction_method"].append(r.extraction_method)
+            for role, ids in (("reactant", r.reactant_ids), ("reagent", r.reagent_ids), ("product", r.product_ids)):
+                smiles = ReactionData.molecules.lookup(ids)
+                reactions[f"{role}_smiles"].append(smiles)
+                for position, (molecule_id, value) in enumerate(zip(ids, smiles)):
+                    components["reaction_id"].append(reaction_id)
+                    components["role"].append(role.upper())
+                    components["position"].append(position)
+                    components["molecule_id"].append(molecule_id)
+                    components["smiles"].append(value)
+
+        pa = self._pa
+        self._writers[0].write_table(pa.Table.from_pydict(reactions, schema=self._reaction_schema))
+        self._writers[1].write_table(pa.Table.from_pydict(components, schema=self._component_schema))
+        self.count += len(batch)
+
+    def close(self):
+        self._flush(self._pending)
+        self._pending = []
+        for writer in self._writers:
+            writer.close()
+
+class RateLimiter:
+    """
+    Token bucket for one host (same as RateLimiter in ORD_SCAPER/ord_scraper.py.py):
+    `rate` requests/sec with bursts of up to `burst`; pause() honours Retry-After.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def reserve(self) -> float:
+        """Claims the next token and returns the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._paused_until - now)
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    delay = max(delay, -self._tokens / self.rate)
+            return delay
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+class DedupeIndex(abc.ABC):
+    """
+    Set of reaction keys already collected. add() is atomic and thread-safe,
+    so one index can be shared by every scraper in a batch crawl.
+    """
+
+    @abc.abstractmethod
+    def add(self, key: str) -> bool:
+        """Records `key`; returns True if it had not been seen before."""
+
+    @abc.abstractmethod
+    def __contains__(self, key: str) -> bool:
+        """Whether `key` has been recorded, without recording it."""
+
+    def close(self):
+        """Persists the index, for the on-disk variants."""
+
+    @staticmethod
+    def digest(key: str, bits: int) -> bytes:
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=bits // 8).digest()
+
+class DigestSet(DedupeIndex):
+    """In-memory set of 64- or 128-bit digests instead of full SMILES strings."""
+
+    def __init__(self, digest_bits: int = 64):
+        self.digest_bits = digest_bits
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def add(self, key: str) -> bool:
+        digest = int.from_bytes(self.digest(key, self.digest_bits), "big")
+        with self._lock:
+            if digest in self._seen:
+                return False
+            self._seen.add(digest)
+            return True
+
+    def __contains__(self, key: str) -> bool:
+        return int.from_bytes(self.digest(key, self.digest_bits), "big") in self._seen
+
+    def __len__(self):
+        return len(self._seen)
+
+class SqliteDedupeIndex(DedupeIndex):
+    """
+    Digests kept in a SQLite table, so memory stays constant and the index
+    persists across runs. Inserts are committed in batches of `batch`.
+    """
+
+    def __init__(self, path: str, digest_bits: int = 128, batch: int = 1000):
+        self.digest_bits = digest_bits
+        self.batch = batch
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen_reactions (digest BLOB PRIMARY KEY) WITHOUT ROWID")
+
+    def add(self, key: str) -> bool:
+        digest = self.digest(key, self.digest_bits)
+        with self._lock:
+            if not self._pending:
+                self.conn.execute("BEGIN")
+            new = self.conn.execute("INSERT OR IGNORE INTO seen_reactions VALUES (?)", (digest,)).rowcount == 1
+            self._pending += 1
+            if self._pending >= self.batch:
+                self.conn.execute("COMMIT")
+                self._pending = 0
+            return new
+
+    def __contains__(self, key: str) -> bool:
+        digest = self.digest(key, self.digest_bits)
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM seen_reactions WHERE digest = ?", (digest,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM seen_reactions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._pending:
+                self.conn.execute("COMMIT")
+                self._pending = 0
+            self.conn.close()
+
+class BloomDedupeIndex(DedupeIndex):
+    """
+    Bloom filter sized for `capacity` keys at false-positive rate `fp_rate`:
+    fixed memory (about 1.2 bytes per key at 1%), at the cost of skipping
+    that fraction of genuinely new reactions. Saved to `path` on close and
+    reloaded, with its original sizing, on the next run.
+    """
+
+    MAGIC = b"KMTBLOOM"
+    HEADER = struct.Struct(">8sQIQ")
+
+    def __init__(self, capacity: int = 1_000_000, fp_rate: float = 0.001, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                magic, self.num_bits, self.num_hashes, self.count = self.HEADER.unpack(f.read(self.HEADER.size))
+                if magic != self.MAGIC:
+                    raise ValueError(f"{path} is not a Bloom filter file")
+                self._bits = bytearray(f.read())
+            return
+        self.num_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = self.digest(key, 128)
+        h1, h2 = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> bool:
+        positions = self._positions(key)
+        with self._lock:
+            if all(self._bits[p >> 3] & (1 << (p & 7)) for p in positions):
+                return False
+            for p in positions:
+                self._bits[p >> 3] |= 1 << (p & 7)
+            self.count += 1
+            return True
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        with self._lock:
+            return all(self._bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if not self.path:
+            return
+        with self._lock:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.num_bits, self.num_hashes, self.count))
+                f.write(self._bits)
+            os.replace(tmp_path, self.path)
+
+class StagedDedupeIndex(DedupeIndex):
+    """
+    Claims keys in memory and writes them to the wrapped `index` only on
+    commit(), once their reactions are saved. release() forgets the claims
+    of reactions that never made it to disk, so a failed or interrupted
+    crawl does not mark them seen for the next run.
+    """
+
+    def __init__(self, index: DedupeIndex):
+        self.index = index
+        self._claimed = set()
+        self._lock = threading.Lock()
+
+    def add(self, key: str) -> bool:
+        with self._lock:
+            if key in self._claimed or key in self.index:
+                return False
+            self._claimed.add(key)
+            return True
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._claimed or key in self.index
+
+    def commit(self, keys: Iterable[str]):
+        for key in keys:
+            self.index.add(key)
+        self.release(keys)
+
+    def release(self, keys: Iterable[str]):
+        with self._lock:
+            self._claimed.difference_update(keys)
+
+    def close(self):
+        self.index.close()
+
+def open_dedupe_index(kind: str = "memory", path: Optional[str] = None, digest_bits: int = 64,
+                      capacity: int = 1_000_000, fp_rate: float = 0.001) -> DedupeIndex:
+    """Builds the dedupe index named by --dedupe; "sqlite" and "bloom" persist to `path`."""
+    if kind == "memory":
+        return DigestSet(digest_bits)
+    if kind == "sqlite":
+        return SqliteDedupeIndex(path or "kmt_seen.db", digest_bits=max(64, digest_bits))
+    if kind == "bloom":
+        return BloomDedupeIndex(capacity, fp_rate, path or "kmt_seen.bloom")
+    raise ValueError(f"Unknown dedupe index {kind!r}; choose from memory, sqlite, bloom")
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9",
+    })
+    return session
 
 class KMTScraperPro:
     BASE_URL = "https://kmt.vander-lingen.nl"
 
-    def __init__(self, doi: str = "10.1021/jacsau.4c01276"):
+    MAX_RETRIES = 3
+
+    PAGE_SIZE = 10
+
+    def __init__(self, doi: str = "10.1021/jacsau.4c01276", rate: float = 0.5, burst: int = 1,
+                 limiter: Optional[RateLimiter] = None, pool_size: int = 10,
+                 session: Optional[requests.Session] = None, seen_smiles: Optional[DedupeIndex] = None,
+                 host_slots: Optional[threading.Semaphore] = None,
+                 verbose: bool = True, html_backend: str = "auto",
+                 canonicalizer: Optional[SmilesCanonicalizer] = None):
+        """
+        A batch crawl shares one `limiter`, `session`, `seen_smiles` dedupe
+        index and `host_slots` semaphore capping concurrent requests to the
+        host across every per-DOI scraper. Reactions are deduplicated on the
+        canonical form from `canonicalizer` (RDKit when installed); component
+        SMILES are interned in the shared ReactionData.molecules table.
+        """
         self.doi = doi
-        self.session = self._init_session()
+        self.canonicalizer = canonicalizer or SmilesCanonicalizer()
+        self.molecules = ReactionData.molecules
+        self.html_backend = resolve_html_backend(html_backend)
+        self.scan_page = HTML_BACKENDS[self.html_backend]
+        self.limiter = limiter or RateLimiter(rate, burst)
+        self.pool_size = pool_size
+        self.session = session or self._init_session()
         self.collected_reactions: List[ReactionData] = []
-        self.seen_smiles = set()
+        self.seen_smiles = seen_smiles if seen_smiles is not None else DigestSet()
+        self.host_slots = host_slots
+        self.verbose = verbose
+        self.pages_scraped = 0
+        self.first_status: Optional[int] = None
 
     def _init_session(self) -> requests.Session:
-        session = requests.Session()
-        session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9",
-        })
-        return session
+        return make_session(self.pool_size)
+
+    def _log(self, message: str):
+        if self.verbose:
+            print(message)
+
+    def _get(self, url: str) -> requests.Response:
+        """Rate-limited GET; a 429 pauses the limiter for its Retry-After and is retried."""
+        for attempt in range(self.MAX_RETRIES + 1):
+            self.limiter.wait()
+            with self.host_slots or nullcontext():
+                response = self.session.get(url, timeout=20)
+            if response.status_code != 429 or attempt == self.MAX_RETRIES:
+                return response
+            retry_after = response.headers.get("Retry-After", "")
+            self.limiter.pause(float(retry_after) if retry_after.isdigit() else 2.0 ** attempt)
+        return response
 
     def _parse_smiles_string(self, smiles: str) -> Optional[dict]:
         """Splits a reaction SMILES into its components."""
@@ -61,73 +782,141 @@ class KMTScraperPro:
         except Exception:
             return None
 
-    def _extract_all_potential_smiles(self, soup: BeautifulSoup, html: str) -> List[tuple]:
-        """Multimodal extraction: attributes, JS, and raw text patterns."""
-        found = []
+    def _extract_all_potential_smiles(self, page: PageScan) -> List[tuple]:
+        """
+        Multimodal extraction: data-reaction-smiles attributes, then quoted
+        reaction SMILES inside script text and other attribute values.
+        """
+        found = [(smiles, "data-attr") for smiles in page.attr_smiles]
 
-        
-        for el in soup.find_all(attrs={"data-reaction-smiles": True}):
-            found.append((el.get("data-reaction-smiles"), "data-attr"))
-
-       
-        js_patterns = [
-            r"['\"]([A-Za-z0-9\[\]()=#@+\-\\/.>]+>>?[A-Za-z0-9\[\]()=#@+\-\\/.>]+)['\"]",
-        ]
-        for pattern in js_patterns:
-            matches = re.findall(pattern, html)
-            for m in matches:
-                if ">" in m and len(m) > 5:
-                    found.append((m, "js-regex"))
+        for regions, method in ((page.scripts, "js-regex"), (page.attr_values, "attr-regex")):
+            for region in regions:
+                if ">" not in region:
+                    continue
+                # An attribute value is quoted in the markup, so it may be a SMILES token on its own.
+                text = region if method == "js-regex" else f'"{region}"'
+                for m in QUOTED_REACTION_SMILES.findall(text):
+                    if len(m) > 5:
+                        found.append((m, method))
         
         return found
 
-    def scrape(self, max_pages: int = 5):
-        current_url = f"{self.BASE_URL}/data/reaction/doi/{self.doi}/start/0"
+    def _page_url(self, index: int) -> str:
+        return f"{self.BASE_URL}/data/reaction/doi/{self.doi}/start/{index * self.PAGE_SIZE}"
+
+    def _extract_page(self, url: str, html: str) -> Tuple[List[ReactionCandidate], Optional[str]]:
+        """Parses one page into its reactions (not yet deduplicated) and the "Next" link, if any."""
+        page = self.scan_page(html)
+        reactions = []
+        for smiles, method in self._extract_all_potential_smiles(page):
+            parsed = self._parse_smiles_string(smiles)
+            if parsed:
+                reactions.append(ReactionCandidate(
+                    reaction_smiles=smiles,
+                    parsed=parsed,
+                    source_url=url,
+                    scraped_ts=int(time.time()),
+                    extraction_method=method,
+                    canonical_smiles=self.canonicalizer.reaction(smiles, parsed)
+                ))
+
+        next_url = None
+        if page.next_href:
+            href = page.next_href
+            next_url = href if href.startswith("http") else self.BASE_URL + href
+        return reactions, next_url
+
+    def dedupe_keys(self) -> List[str]:
+        """The keys the collected reactions were deduplicated on."""
+        return [r.canonical_smiles or r.reaction_smiles for r in self.collected_reactions]
+
+    def _add_reactions(self, reactions: List[ReactionCandidate]) -> int:
+        """
+        Keeps reactions whose SMILES have not been seen yet, interning their
+        components only then; returns how many were new.
+        """
+        new_count = 0
+        for reaction in reactions:
+            if self.seen_smiles.add(reaction.canonical_smiles or reaction.reaction_smiles):
+                parsed = reaction.parsed
+                self.collected_reactions.append(ReactionData(
+                    reaction_smiles=reaction.reaction_smiles,
+                    reactant_ids=self.molecules.intern_all(parsed["reactants"]),
+                    reagent_ids=self.molecules.intern_all(parsed["reagents"]),
+                    product_ids=self.molecules.intern_all(parsed["products"]),
+                    source_url=reaction.source_url,
+                    scraped_ts=reaction.scraped_ts,
+                    extraction_method=reaction.extraction_method,
+                    canonical_smiles=reaction.canonical_smiles
+                ))
+                new_count += 1
+        self.pages_scraped += 1
+        return new_count
+
+    def scrape(self, max_pages: int = 5, workers: int = 1):
+        """
+        Follows the DOI's pages one after another, or with `workers` > 1
+        fetches `start/N` pages concurrently (see _scrape_parallel).
+        """
+        if workers > 1:
+            return self._scrape_parallel(max_pages, workers)
+
+        current_url = self._page_url(0)
         
         for i in range(max_pages):
-            print(f"--- Processing Page {i+1} | {current_url} ---")
+            self._log(f"--- Processing Page {i+1} | {current_url} ---")
             
-            response = self.session.get(current_url, timeout=20)
+            response = self._get(current_url)
+            if i == 0:
+                self.first_status = response.status_code
             if response.status_code != 200:
                 break
                 
-            soup = BeautifulSoup(response.text, "html.parser")
-            raw_data = self._extract_all_potential_smiles(soup, response.text)
-            
-            new_count = 0
-            for smiles, method in raw_data:
-                if smiles not in self.seen_smiles:
-                    parsed = self._parse_smiles_string(smiles)
-                    if parsed:
-                        self.collected_reactions.append(ReactionData(
-                            reaction_smiles=smiles,
-                            reactant_smiles=parsed["reactants"],
-                            reagent_smiles=parsed["reagents"],
-                            product_smiles=parsed["products"],
-                            source_url=current_url,
-                            scraped_at=datetime.now().isoformat(),
-                            extraction_method=method
-                        ))
-                        self.seen_smiles.add(smiles)
-                        new_count += 1
-            
-            print(f"Found {new_count} new reactions.")
+            reactions, next_url = self._extract_page(current_url, response.text)
+            new_count = self._add_reactions(reactions)
+            self._log(f"Found {new_count} new reactions.")
 
-            
-            next_link = soup.find("a", string=re.compile(r"Next", re.I))
-            if next_link and next_link.get("href"):
-                href = next_link["href"]
-                current_url = href if href.startswith("http") else self.BASE_URL + href
-            else:
-                
-                start_val = (i + 1) * 10
-                current_url = f"{self.BASE_URL}/data/reaction/doi/{self.doi}/start/{start_val}"
+            current_url = next_url or self._page_url(i + 1)
+
+    def _fetch_page(self, index: int) -> Tuple[int, List[ReactionCandidate]]:
+        url = self._page_url(index)
+        response = self._get(url)
+        if response.status_code != 200:
+            return response.status_code, []
+        return response.status_code, self._extract_page(url, response.text)[0]
 
-            time.sleep(random.uniform(1.0, 2.5))
+    def _scrape_parallel(self, max_pages: int, workers: int):
+        """
+        Speculatively fetches up to `workers` pages ahead through the shared
+        rate limiter, and merges them strictly in page order. The crawl ends
+        at the first page that is not 200 or has no reactions; pages fetched
+        past it are discarded.
+        """
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            next_index = 0
+            while next_index < max_pages or in_flight:
+                while next_index < max_pages and len(in_flight) < workers:
+                    in_flight.append((next_index, pool.submit(self._fetch_page, next_index)))
+                    next_index += 1
+
+                index, future = in_flight.popleft()
+                status, reactions = future.result()
+                if index == 0:
+                    self.first_status = status
+                if status != 200 or not reactions:
+                    self._log(f"--- Page {index+1} returned {status} with {len(reactions)} reactions; stopping ---")
+                    for _, pending in in_flight:
+                        pending.cancel()
+                    break
+
+                self._log(f"--- Processing Page {index+1} | {self._page_url(index)} ---")
+                new_count = self._add_reactions(reactions)
+                self._log(f"Found {new_count} new reactions.")
 
     def save_results(self, filename: str):
         """Saves to both JSON and CSV for convenience."""
-        dicts = [asdict(r) for r in self.collected_reactions]
+        dicts = [r.to_dict() for r in self.collected_reactions]
         
         
         with open(f"{filename}.json", "w") as f:
@@ -138,8 +927,202 @@ class KMTScraperPro:
         df.to_csv(f"{filename}.csv", index=False)
         print(f"Success! Saved {len(df)} reactions to {filename}.json and {filename}.csv")
 
+    def save_molecule_tables(self, filename: str):
+        """
+        Normalized export: {filename}_molecules.csv maps molecule_id to SMILES,
+        and {filename}_reactions.csv lists each reaction's component ids
+        (space-separated) instead of repeating the strings.
+        """
+        self.molecules.save(f"{filename}_molecules.csv")
+        with open(f"{filename}_reactions.csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(REACTION_ID_COLUMNS)
+            writer.writerows(reaction_id_row(r) for r in self.collected_reactions)
+        print(f"Saved {len(self.molecules)} molecules and {len(self.collected_reactions)} reactions to "
+              f"{filename}_molecules.csv and {filename}_reactions.csv")
+
+    def save_parquet(self, filename: str):
+        """Writes {filename}.parquet and {filename}_components.parquet (see ParquetExport)."""
+        export = ParquetExport(filename)
+        try:
+            export.write(self.collected_reactions)
+        finally:
+            export.close()
+        print(f"Saved {export.count} reactions to {export.paths[0]} and {export.paths[1]}")
+
+    def save_to_sqlite(self, db_path: str):
+        """Adds the collected reactions to a ReactionStore file, deduplicating across runs."""
+        store = ReactionStore(db_path)
+        try:
+            new = store.write_reactions(self.collected_reactions, self.doi)
+        finally:
+            store.close()
+        print(f"Stored {len(self.collected_reactions)} reactions in {db_path} ({new} new)")
+
+def crawl_dois(dois: List[str], db_path: str, max_pages: int = 5, workers: int = 8, page_workers: int = 1,
+               rate: float = 2.0, burst: int = 4, host_connections: int = 8,
+               html_backend: str = "auto", seen: Optional[DedupeIndex] = None,
+               canonical: str = "auto", parquet_prefix: Optional[str] = None,
+               tables_prefix: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Crawls many DOIs on a pool of `workers` threads and returns the (doi, error) failures.
+
+    All crawls share one session, token bucket and dedupe index (`seen`,
+    in-memory digests by default), and at most `host_connections` requests
+    are open against the KMT host at once. Each DOI's reactions are written
+    to the ReactionStore at `db_path` (and to a ParquetExport at
+    `parquet_prefix`, if given) as soon as it finishes, so memory stays flat
+    however long the list is. Their keys enter `seen` only after that write;
+    a failed DOI leaves nothing behind in the index. With `tables_prefix`,
+    the normalized export (see save_molecule_tables) is written as well:
+    reactions appended per DOI, the molecules table once the crawl ends.
+    """
+    limiter = RateLimiter(rate, burst)
+    session = make_session(host_connections)
+    host_slots = threading.BoundedSemaphore(host_connections)
+    seen = StagedDedupeIndex(seen if seen is not None else DigestSet())
+    canonicalizer = SmilesCanonicalizer(canonical)
+    store = ReactionStore(db_path)
+    export = ParquetExport(parquet_prefix) if parquet_prefix else None
+    tables_file = open(f"{tables_prefix}_reactions.csv", "w", newline="") if tables_prefix else None
+    tables = csv.writer(tables_file) if tables_file else None
+    if tables:
+        tables.writerow(REACTION_ID_COLUMNS)
+    failures = []
+    total = 0
+
+    def crawl(doi: str) -> KMTScraperPro:
+        scraper = KMTScraperPro(doi, limiter=limiter, session=session, seen_smiles=seen,
+                                host_slots=host_slots, verbose=False,
+                                html_backend=html_backend, canonicalizer=canonicalizer)
+        try:
+            scraper.scrape(max_pages=max_pages, workers=page_workers)
+        except Exception:
+            seen.release(scraper.dedupe_keys())
+            raise
+        return scraper
+
+    def handle(done: int, doi: str, future):
+        nonlocal total
+        try:
+            scraper = future.result()
+        except Exception as e:
+            failures.append((doi, str(e)))
+            print(f"[{done}/{len(dois)}] {doi}: FAILED ({e})")
+            return
+        if scraper.pages_scraped == 0 and scraper.first_status != 200:
+            failures.append((doi, f"HTTP {scraper.first_status}"))
+            print(f"[{done}/{len(dois)}] {doi}: FAILED (HTTP {scraper.first_status})")
+            return
+        keys = scraper.dedupe_keys()
+        try:
+            new = store.write_reactions(scraper.collected_reactions, doi)
+            if export:
+                export.write(scraper.collected_reactions)
+            if tables:
+                tables.writerows(reaction_id_row(r) for r in scraper.collected_reactions)
+        except BaseException:
+            seen.release(keys)
+            raise
+        seen.commit(keys)
+        total += len(scraper.collected_reactions)
+        print(f"[{done}/{len(dois)}] {doi}: {scraper.pages_scraped} pages, "
+              f"{len(scraper.collected_reactions)} reactions ({new} new in store)")
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Submit in a window of 2x workers and drop each future once handled, so a
+            # finished scraper and its reactions are freed as soon as they are stored.
+            pending = {}
+            remaining = iter(dois)
+            done = 0
+            while True:
+                for doi in remaining:
+                    pending[pool.submit(crawl, doi)] = doi
+                    if len(pending) >= 2 * workers:
+                        break
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done += 1
+                    handle(done, pending.pop(future), future)
+    finally:
+        store.close()
+        session.close()
+        if export:
+            export.close()
+        if tables_file:
+            tables_file.close()
+            ReactionData.molecules.save(f"{tables_prefix}_molecules.csv")
+
+    print(f"Done: {total} reactions from {len(dois) - len(failures)}/{len(dois)} DOIs into {db_path}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape reaction SMILES from KMT DOI pages.")
+    parser.add_argument("--doi", default="10.1021/jacsau.4c01276", help="Single DOI to scrape.")
+    parser.add_argument("--doi_file", default=None, help="Text file with one DOI per line; crawls them all in batch.")
+    parser.add_argument("--max_pages", type=int, default=3, help="Pages to fetch per DOI (default: 3).")
+    parser.add_argument("--workers", type=int, default=8, help="DOIs crawled concurrently in batch mode (default: 8).")
+    parser.add_argument("--page_workers", type=int, default=1, help="Pages fetched ahead concurrently per DOI (default: 1).")
+    parser.add_argument("--host_connections", type=int, default=8, help="Max concurrent requests to the KMT host in batch mode (default: 8).")
+    parser.add_argument("--rate", type=float, default=None, help="Requests per second (default: 0.5 single, 2.0 batch).")
+    parser.add_argument("--burst", type=int, default=None, help="Token bucket size (default: 1 single, 4 batch).")
+    parser.add_argument("--html_backend", choices=["auto", *HTML_BACKENDS], default="auto",
+                        help="Page parser: lxml, the stdlib stream tokenizer, or BeautifulSoup (default: auto = lxml if installed).")
+    parser.add_argument("--dedupe", choices=["memory", "sqlite", "bloom"], default="memory",
+                        help="Dedupe index: in-memory digests, or a SQLite table / Bloom filter that persists across runs.")
+    parser.add_argument("--dedupe_path", default=None, help="File for --dedupe sqlite/bloom (default: kmt_seen.db / kmt_seen.bloom).")
+    parser.add_argument("--digest_bits", type=int, choices=[64, 128], default=64, help="Digest size for memory/sqlite dedupe (default: 64).")
+    parser.add_argument("--bloom_capacity", type=int, default=1_000_000, help="Expected reactions for --dedupe bloom (default: 1e6).")
+    parser.add_argument("--bloom_fp_rate", type=float, default=0.001, help="False-positive rate for --dedupe bloom (default: 0.001).")
+    parser.add_argument("--canonical", choices=["auto", "rdkit", "sorted", "none"], default="auto",
+                        help="Dedupe key: RDKit canonical SMILES, sorted components, or the raw string (default: auto = rdkit if installed).")
+    parser.add_argument("--out", default="kmt_data_export", help="Output prefix for exports: JSON/CSV (single DOI) and _molecules/_reactions CSV tables (both modes).")
+    parser.add_argument("--parquet", action="store_true",
+                        help="Also write --out.parquet (list<string> component columns) and --out_components.parquet (long format); requires pyarrow.")
+    parser.add_argument("--sqlite_db", default="reactions.db", help="ReactionStore SQLite file (default: reactions.db).")
+    parser.add_argument("--failures_out", default="kmt_failed_dois.txt", help="Where batch mode lists DOIs that failed.")
+    args = parser.parse_args()
+
+    seen = open_dedupe_index(args.dedupe, args.dedupe_path, args.digest_bits, args.bloom_capacity, args.bloom_fp_rate)
+    staged = StagedDedupeIndex(seen)
+    try:
+        if args.doi_file:
+            with open(args.doi_file) as f:
+                dois = list(dict.fromkeys(line.strip() for line in f if line.strip() and not line.startswith("#")))
+            failures = crawl_dois(
+                dois, args.sqlite_db, max_pages=args.max_pages, workers=args.workers,
+                page_workers=args.page_workers, rate=args.rate if args.rate is not None else 2.0,
+                burst=args.burst if args.burst is not None else 4, host_connections=args.host_connections,
+                html_backend=args.html_backend, seen=seen, canonical=args.canonical,
+                parquet_prefix=args.out if args.parquet else None, tables_prefix=args.out
+            )
+            if failures:
+                with open(args.failures_out, "w") as f:
+                    f.writelines(f"{doi}\t{error}\n" for doi, error in failures)
+                print(f"{len(failures)} DOIs failed; see {args.failures_out}", file=sys.stderr)
+            return
+
+        scraper = KMTScraperPro(
+            doi=args.doi,
+            rate=args.rate if args.rate is not None else 0.5,
+            burst=args.burst if args.burst is not None else 1,
+            html_backend=args.html_backend,
+            seen_smiles=staged,
+            canonicalizer=SmilesCanonicalizer(args.canonical)
+        )
+        scraper.scrape(max_pages=args.max_pages, workers=args.page_workers)
+        scraper.save_results(args.out)
+        scraper.save_molecule_tables(args.out)
+        if args.parquet:
+            scraper.save_parquet(args.out)
+        scraper.save_to_sqlite(args.sqlite_db)
+        staged.commit(scraper.dedupe_keys())
+    finally:
+        seen.close()
+
 if __name__ == "__main__":
-    
-    scraper = KMTScraperPro(doi="10.1021/jacsau.4c01276")
-    scraper.scrape(max_pages=3) 
-    scraper.save_results("kmt_data_export")
\ No newline at end of file
+    main()
@@ -0,0 +1,118 @@
+"""
+Micro-benchmark for extract_reaction_data.
+
+Builds synthetic ORD reactions and reports reactions/second for the original
+per-component extraction (import, enum-name lookup and CORE_CATEGORIES scan
+inside the loop) and for the precomputed schema context in ord_scraper.
+
+    python bench_extract.py --reactions 20000
+"""
+import argparse
+import importlib.util
+import os
+import time
+from typing import Any, Dict, List
+
+
+def load_scraper():
+    """Imports ord_scraper.py.py, whose double extension defeats a plain import."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ord_scraper.py.py")
+    spec = importlib.util.spec_from_file_location("ord_scraper", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_extract(rxn, dataset_id: str, core_categories) -> Dict[str, Any]:
+    """The pre-optimization inner loop, kept for comparison."""
+    extracted_roles: Dict[str, List[Dict]] = {k: [] for k in core_categories}
+    for input_key, reaction_input in rxn.inputs.items():
+        normalized_key = input_key.strip().lower().replace("_", " ")
+        for component in reaction_input.components:
+            texts = []
+            for ident in component.identifiers:
+                if ident.value:
+                    texts.append(ident.value)
+            text_id = "; ".join(texts)
+            if not text_id:
+                continue
+            try:
+                from ord_schema.proto import reaction_pb2
+                role_name = reaction_pb2.ReactionRole.ReactionRoleType.Name(component.reaction_role)
+            except Exception:
+                role_name = "UNKNOWN"
+            comp_data = {"value": text_id, "role": role_name}
+            assigned = False
+            for core_key in core_categories:
+                if core_key in normalized_key:
+                    extracted_roles[core_key].append(comp_data)
+                    assigned = True
+                    break
+            if not assigned:
+                extracted_roles.setdefault(normalized_key, []).append(comp_data)
+    return {
+        "dataset_id": dataset_id,
+        "reaction_id": rxn.reaction_id,
+        "components": extracted_roles,
+        "success": bool(rxn.outcomes) and bool(rxn.outcomes[0].products),
+    }
+
+
+def build_reactions(reaction_pb2, count: int) -> List[Any]:
+    """Synthetic Buchwald-Hartwig-style reactions with typical input keys."""
+    role = reaction_pb2.ReactionRole
+    inputs = [
+        ("aryl_halide", role.REACTANT, "Brc1ccc(C)cc1"),
+        ("amine", role.REACTANT, "Cc1ccc(N)cc1"),
+        ("Base", role.REAGENT, "CN1CCCN2CCCN=C12"),
+        ("solvent_1", role.SOLVENT, "CS(C)=O"),
+        ("metal and ligand", role.CATALYST, "CC(C)c1cc(C(C)C)c(-c2ccccc2P(C2CCCCC2)C2CCCCC2)c(C(C)C)c1"),
+        ("additive", role.REAGENT, "c1ccc(-c2ccon2)cc1"),
+    ]
+    reactions = []
+    for i in range(count):
+        rxn = reaction_pb2.Reaction()
+        rxn.reaction_id = f"ord-bench-{i}"
+        for key, role_type, smiles in inputs:
+            component = rxn.inputs[key].components.add()
+            component.reaction_role = role_type
+            identifier = component.identifiers.add()
+            identifier.type = identifier.SMILES
+            identifier.value = smiles
+        product = rxn.outcomes.add().products.add()
+        identifier = product.identifiers.add()
+        identifier.type = identifier.SMILES
+        identifier.value = "Cc1ccc(Nc2ccc(C)cc2)cc1"
+        reactions.append(rxn)
+    return reactions
+
+
+def best_rate(fn, reactions, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for rxn in reactions:
+            fn(rxn)
+        best = min(best, time.perf_counter() - start)
+    return len(reactions) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ORD reaction extraction.")
+    parser.add_argument("--reactions", type=int, default=20000, help="Synthetic reactions to extract (default: 20000).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes; the best is reported (default: 3).")
+    args = parser.parse_args()
+
+    scraper = load_scraper()
+    schema = scraper.get_schema()
+    reactions = build_reactions(schema.reaction_pb2, args.reactions)
+
+    legacy = best_rate(lambda rxn: legacy_extract(rxn, "bench", scraper.CORE_CATEGORIES), reactions, args.repeat)
+    current = best_rate(lambda rxn: scraper.extract_reaction_data(rxn, "bench"), reactions, args.repeat)
+
+    print(f"legacy extraction:      {legacy:>10,.0f} reactions/s")
+    print(f"precomputed extraction: {current:>10,.0f} reactions/s  ({current / legacy:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,23 @@
 import base64
+import codecs
+import functools
+import gzip
+import hashlib
 import json
+import multiprocessing
 import os
 import sys
 import time
 import argparse
-from typing import Dict, List, Any, Optional
+import asyncio
+import random
+import sqlite3
+import threading
+from collections import deque
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlsplit
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -13,24 +26,432 @@ from urllib3.util import Retry
 
 API_BASE = "https://open-reaction-database.org/api"
 USER_AGENT = "ORD-Scraper-Advanced/3.0"
-CORE_CATEGORIES = {"base", "solvent", "amine", "aryl halide", "metal", "ligand"}
+CORE_CATEGORIES = ("base", "solvent", "amine", "aryl halide", "metal", "ligand")
+CATEGORY_CACHE_SIZE = 4096
 REACTION_TIMEOUT_S = 90
+POLL_RESUMES = 2
+DECODE_BATCH_SIZE = 256
+CACHE_TTL_S = 30 * 24 * 3600
+CACHE_LISTING_TTL_S = 3600
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+CHUNK_WORKERS = 4
+CHUNK_RETRIES = 2
+STREAM_CHUNK_BYTES = 64 * 1024
+PARQUET_ROW_GROUP_ROWS = 65536
+DEFAULT_POOL_SIZE = 10
+RETRY_STATUSES = [429, 500, 502, 503, 504]
 
 
 
-def make_session() -> requests.Session:
-    """Creates a requests session with retry logic for robust API calls."""
+class RateLimiter:
+    """
+    Thread-safe token bucket for one host: `rate` requests/sec on average,
+    with up to `burst` requests let through back to back.
+
+    reserve() hands out tokens in arrival order, so concurrent callers queue
+    up at exactly the allowed rate. pause() holds every caller back, e.g. for
+    a 429's Retry-After.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def reserve(self) -> float:
+        """Claims the next token and returns the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._paused_until - now)
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    delay = max(delay, -self._tokens / self.rate)
+            return delay
+
+    def wait(self) -> None:
+        """Blocks the calling thread until its token comes up."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Lets no request through for `seconds` (e.g. a Retry-After header)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class LimiterRetry(Retry):
+    """urllib3 Retry that also pauses a RateLimiter for a response's Retry-After."""
+
+    def __init__(self, *args, limiter: Optional[RateLimiter] = None, **kwargs):
+        self.limiter = limiter
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs) -> "LimiterRetry":
+        retry = super().new(**kwargs)
+        retry.limiter = self.limiter
+        return retry
+
+    def sleep_for_retry(self, response=None) -> bool:
+        retry_after = self.get_retry_after(response) if response is not None else None
+        if retry_after and self.limiter:
+            self.limiter.pause(retry_after)
+        return super().sleep_for_retry(response)
+
+
+class QueryTimeoutError(TimeoutError):
+    """A query task was still pending at the poll deadline; polling can resume on `task_id`."""
+
+    def __init__(self, task_id: str, waited: float):
+        super().__init__(f"Query result for task={task_id} timed out after {waited:.0f}s.")
+        self.task_id = task_id
+        self.waited = waited
+
+
+class OffsetIgnoredError(RuntimeError):
+    """A chunk window came back as nothing but earlier rows, so the server is ignoring `offset`."""
+
+
+class PollScheduler:
+    """
+    Adaptive poll timing for fetch_query_result.
+
+    The first poll is scheduled for when the task is expected to finish,
+    estimated as `base + per_reaction * num_reactions` from a least-squares
+    fit over recently observed task latencies. Later polls back off
+    exponentially with jitter up to `max_delay`.
+    """
+
+    def __init__(
+        self,
+        min_delay: float = 0.2,
+        max_delay: float = 10.0,
+        multiplier: float = 1.6,
+        jitter: float = 0.25,
+        history: int = 50
+    ):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._observations = deque(maxlen=history)
+        self._base = 0.5
+        self._per_reaction = 0.002
+
+    def observe(self, num_reactions: int, elapsed: float) -> None:
+        """Records how long a task of `num_reactions` took and refits the runtime model."""
+        with self._lock:
+            self._observations.append((num_reactions, elapsed))
+            n = len(self._observations)
+            mean_x = sum(x for x, _ in self._observations) / n
+            mean_y = sum(y for _, y in self._observations) / n
+            var_x = sum((x - mean_x) ** 2 for x, _ in self._observations)
+            if var_x > 0:
+                cov = sum((x - mean_x) * (y - mean_y) for x, y in self._observations)
+                self._per_reaction = max(0.0, cov / var_x)
+            self._base = max(0.0, mean_y - self._per_reaction * mean_x)
+
+    def expected_runtime(self, num_reactions: int) -> float:
+        """Estimated server-side runtime in seconds for a query of `num_reactions`."""
+        with self._lock:
+            return self._base + self._per_reaction * num_reactions
+
+    def delays(self, num_reactions: int) -> Iterator[float]:
+        """Yields the wait before each successive poll of one task."""
+        expected = self.expected_runtime(num_reactions)
+        yield self._jittered(max(self.min_delay, expected))
+        delay = max(self.min_delay, expected * 0.25)
+        while True:
+            yield self._jittered(delay)
+            delay = min(self.max_delay, delay * self.multiplier)
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache for ORD API responses.
+
+    Entries are keyed on a SHA-256 of (endpoint, params) and stored as gzipped
+    JSON under `directory`. An SQLite index tracks each entry's expiry, size,
+    last access (for LRU eviction down to `max_bytes`) and the dataset
+    `num_reactions` it was fetched at, so a change in the /datasets listing
+    invalidates exactly the affected datasets.
+    """
+
+    def __init__(self, directory: str, ttl: float = CACHE_TTL_S, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False, isolation_level=None)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                dataset_id TEXT,
+                version INTEGER,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_dataset ON entries (dataset_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+
+    @staticmethod
+    def key(endpoint: str, params: Optional[Dict] = None) -> str:
+        canonical = json.dumps([endpoint, params or {}], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def get(self, endpoint: str, params: Optional[Dict] = None, version: Optional[int] = None) -> Optional[Any]:
+        """Returns the cached payload, or None if missing, expired or fetched at another `version`."""
+        key = self.key(endpoint, params)
+        with self._lock:
+            row = self._conn.execute("SELECT version, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time() or (version is not None and row[0] != version):
+                self._delete([key])
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        try:
+            with gzip.open(self._path(key), "rb") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            with self._lock:
+                self._delete([key])
+            return None
+
+    def put(
+        self,
+        endpoint: str,
+        params: Optional[Dict],
+        payload: Any,
+        ttl: Optional[float] = None,
+        dataset_id: Optional[str] = None,
+        version: Optional[int] = None
+    ) -> None:
+        """Stores `payload`, then evicts least-recently-used entries beyond `max_bytes`."""
+        key = self.key(endpoint, params)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, dataset_id, version, os.path.getsize(path), now + (self.ttl if ttl is None else ttl), now),
+            )
+            self._evict()
+
+    def invalidate_changed(self, datasets: List[Dict]) -> int:
+        """Drops entries for datasets whose num_reactions differs from the listing; returns how many."""
+        current = {d.get("dataset_id"): d.get("num_reactions", 0) for d in datasets}
+        with self._lock:
+            stale = [
+                key for key, dataset_id, version in self._conn.execute(
+                    "SELECT key, dataset_id, version FROM entries WHERE dataset_id IS NOT NULL"
+                )
+                if dataset_id in current and version != current[dataset_id]
+            ]
+            self._delete(stale)
+        return len(stale)
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            victims.append(key)
+            total -= size
+        self._delete(victims)
+
+    def _delete(self, keys: List[str]) -> None:
+        for key in keys:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class HttpStats:
+    """
+    Per-endpoint HTTP counters for sizing the connection pool.
+
+    For each endpoint (last URL path segment): requests, retries, connections
+    opened vs reused and time to first byte (response headers), both per
+    attempt so retries and their backoff sleeps are not folded in, and body
+    bytes read off the wire. Many opened connections
+    relative to requests means the pool is too small and connections are
+    being discarded and re-handshaken.
+    """
+
+    FIELDS = ("requests", "retries", "opened", "reused", "bytes", "ttfb_total", "ttfb_max")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def endpoint(url: str) -> str:
+        return urlsplit(str(url)).path.rstrip("/").rsplit("/", 1)[-1] or "/"
+
+    def _entry(self, endpoint: str) -> Dict[str, float]:
+        entry = self.endpoints.get(endpoint)
+        if entry is None:
+            entry = self.endpoints[endpoint] = dict.fromkeys(self.FIELDS, 0)
+        return entry
+
+    def add(self, endpoint: str, **counts: float) -> None:
+        with self._lock:
+            entry = self._entry(endpoint)
+            for field, value in counts.items():
+                entry[field] += value
+
+    def add_ttfb(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry["ttfb_total"] += seconds
+            entry["ttfb_max"] = max(entry["ttfb_max"], seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for endpoint, entry in sorted(self.endpoints.items()):
+                row = dict(entry)
+                connections = entry["opened"] + entry["reused"]
+                row["ttfb_avg"] = entry["ttfb_total"] / connections if connections else 0.0
+                row["reuse_ratio"] = entry["reused"] / connections if connections else 0.0
+                result[endpoint] = row
+            return result
+
+    def report(self, file=sys.stderr) -> None:
+        print(f"{'endpoint':<20} {'requests':>8} {'retries':>7} {'opened':>6} {'reused':>6} "
+              f"{'ttfb avg':>9} {'ttfb max':>9} {'MB':>8}", file=file)
+        for endpoint, row in self.summary().items():
+            print(f"{endpoint:<20} {row['requests']:>8.0f} {row['retries']:>7.0f} {row['opened']:>6.0f} "
+                  f"{row['reused']:>6.0f} {row['ttfb_avg']:>8.3f}s {row['ttfb_max']:>8.3f}s "
+                  f"{row['bytes'] / 1e6:>8.2f}", file=file)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+class AttemptStatsPool:
+    """
+    Connection pool mixin reporting every attempt urllib3 makes to `stats`:
+    whether its connection was opened or reused, and its time to first byte.
+    Retries happen above this level, so their backoff sleeps are not timed.
+    """
+
+    stats: Optional[HttpStats] = None
+
+    def _make_request(self, conn, method, url, *args, **kwargs):
+        endpoint = HttpStats.endpoint(url)
+        opened = conn.sock is None
+        self.stats.add(endpoint, opened=int(opened), reused=int(not opened))
+        start = time.perf_counter()
+        resp = super()._make_request(conn, method, url, *args, **kwargs)
+        self.stats.add_ttfb(endpoint, time.perf_counter() - start)
+        return resp
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """HTTPAdapter that reports each request to an HttpStats (attempts via AttemptStatsPool)."""
+
+    def __init__(self, stats: HttpStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: type(f"AttemptStats{cls.__name__}", (AttemptStatsPool, cls), {"stats": self.stats})
+            for scheme, cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def send(self, request, stream=False, **kwargs):
+        endpoint = HttpStats.endpoint(request.url)
+        resp = super().send(request, stream=stream, **kwargs)
+        raw = resp.raw
+        retries = getattr(raw, "retries", None)
+        self.stats.add(endpoint, requests=1, retries=len(retries.history) if retries else 0)
+
+        if not stream:
+            resp.content
+            self.stats.add(endpoint, bytes=raw.tell())
+        else:
+            close = resp.close
+            counted = []
+
+            def close_and_count():
+                if not counted:
+                    counted.append(True)
+                    self.stats.add(endpoint, bytes=raw.tell())
+                close()
+
+            resp.close = close_and_count
+        return resp
+
+
+def pool_size_for(concurrency: int, chunk_size: int = 0, chunk_workers: int = CHUNK_WORKERS) -> int:
+    """Connections needed so every request in flight can hold one without churning the pool."""
+    per_dataset = max(1, chunk_workers) if chunk_size else 1
+    return max(DEFAULT_POOL_SIZE, concurrency * per_dataset)
+
+
+def make_session(
+    pool_maxsize: int = DEFAULT_POOL_SIZE,
+    stats: Optional[HttpStats] = None,
+    limiter: Optional[RateLimiter] = None
+) -> requests.Session:
+    """
+    Creates a requests session with retry logic for robust API calls.
+
+    `pool_maxsize` is the number of keep-alive connections kept per host;
+    with `stats`, every request is recorded in that HttpStats. A Retry-After
+    on a retried response also pauses `limiter` for every other caller.
+    """
     session = requests.Session()
-    retries = Retry(
+    retries = LimiterRetry(
         total=5,
         connect=5,
         read=5,
         backoff_factor=1.0,  
-        status_forcelist=[429, 500, 502, 503, 504],
+        status_forcelist=RETRY_STATUSES,
         allowed_methods=["GET"],
         raise_on_status=False,
+        limiter=limiter,
     )
-    adapter = HTTPAdapter(max_retries=retries)
+    if stats is not None:
+        adapter = InstrumentedAdapter(stats, max_retries=retries, pool_maxsize=pool_maxsize)
+    else:
+        adapter = HTTPAdapter(max_retries=retries, pool_maxsize=pool_maxsize)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     session.headers.update({
@@ -39,185 +460,1738 @@ def make_session() -> requests.Session:
     })
     return session
 
-def submit_query(session: requests.Session, dataset_id: str, limit: int) -> str:
-    """Submits a query to fetch reactions and returns the task ID."""
-    url = f"{API_BASE}/submit_query"
-    params = {"dataset_id": dataset_id, "limit": limit}
-    resp = session.get(url, params=params, timeout=30)
-    resp.raise_for_status()
-    
-    return resp.text.strip().strip('"')
+def get_datasets(
+    session: requests.Session,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[ResponseCache] = None
+) -> List[Dict]:
+    """
+    Fetches the /datasets listing, served from `cache` while fresh.
+
+    A freshly fetched listing also invalidates cached query results for any
+    dataset whose num_reactions has changed.
+    """
+    datasets = cache.get("datasets") if cache else None
+    if datasets is not None:
+        return datasets
+    
+    if limiter:
+        limiter.wait()
+    resp = session.get(f"{API_BASE}/datasets", timeout=30)
+    resp.raise_for_status()
+    datasets = resp.json()
+    remember_listing(cache, datasets)
+    return datasets
+
+def remember_listing(cache: Optional[ResponseCache], datasets: List[Dict]) -> None:
+    """Caches a freshly fetched listing and drops cached results of datasets whose num_reactions changed."""
+    if cache:
+        cache.put("datasets", None, datasets, ttl=CACHE_LISTING_TTL_S)
+        cache.invalidate_changed(datasets)
+
+def select_datasets(
+    datasets: List[Dict],
+    dataset_ids: Optional[List[str]] = None,
+    snapshot: Optional[Dict[str, int]] = None,
+    checkpoint: Optional["ScrapeCheckpoint"] = None
+) -> List[Dict]:
+    """
+    Narrows the listing to the datasets a run should process, for either
+    engine: those named in `dataset_ids`, then (delta mode) those new or
+    grown since `snapshot`, minus any `checkpoint` already records as done.
+    """
+    if dataset_ids:
+        datasets = [d for d in datasets if d.get("dataset_id") in dataset_ids]
+    
+    if snapshot is not None:
+        datasets = diff_listing(datasets, snapshot)
+        print(f"Delta mode: {len(datasets)} datasets are new or have grown since the snapshot.", file=sys.stderr)
+    if checkpoint:
+        done_ids = checkpoint.completed()
+        if done_ids:
+            print(f"Resuming: skipping {len(done_ids)} datasets completed in a previous run.", file=sys.stderr)
+        datasets = [d for d in datasets if d.get("dataset_id") not in done_ids]
+    
+    print(f"Found {len(datasets)} datasets matching criteria.", file=sys.stderr)
+    return datasets
+
+def submit_query(
+    session: requests.Session,
+    dataset_id: str,
+    limit: int,
+    limiter: Optional[RateLimiter] = None,
+    offset: int = 0
+) -> str:
+    """Submits a query to fetch reactions (optionally from `offset`) and returns the task ID."""
+    url = f"{API_BASE}/submit_query"
+    params = {"dataset_id": dataset_id, "limit": limit}
+    if offset:
+        params["offset"] = offset
+    if limiter:
+        limiter.wait()
+    resp = session.get(url, params=params, timeout=30)
+    resp.raise_for_status()
+    
+    return resp.text.strip().strip('"')
+
+class JsonArrayStreamParser:
+    """
+    Incremental parser for a top-level JSON array arriving in byte chunks.
+
+    feed() returns the elements completed by each chunk, so only the current
+    partial element is ever buffered rather than the whole body.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._state = "start"
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        buf = self._buf + self._utf8.decode(chunk)
+        items = []
+        pos, end = 0, len(buf)
+        while self._state != "done":
+            while pos < end and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos >= end:
+                break
+            if self._state == "start":
+                if buf[pos] != "[":
+                    raise ValueError("expected a JSON array")
+                self._state = "items"
+                pos += 1
+            elif buf[pos] == ",":
+                pos += 1
+            elif buf[pos] == "]":
+                self._state = "done"
+                pos += 1
+            else:
+                try:
+                    item, item_end = self._decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    break
+                # A number or literal is only complete once a delimiter follows it:
+                # "[1." + "5]" decodes as 1 up to the ".", and "[12" + "3]" as 12.
+                if not isinstance(item, (dict, list, str)) and (item_end == end or buf[item_end] not in ",] \t\r\n"):
+                    break
+                items.append(item)
+                pos = item_end
+        self._buf = buf[pos:]
+        return items
+
+    def close(self) -> None:
+        if self._state != "done":
+            raise ValueError("truncated JSON array")
+
+
+def _poll_until_ready(
+    session: requests.Session,
+    task_id: str,
+    limiter: Optional[RateLimiter],
+    scheduler: Optional[PollScheduler],
+    num_reactions: int,
+    timeout: float,
+    stream: bool = False
+) -> requests.Response:
+    """Polls fetch_query_result and returns the first 200 response (body unread if `stream`)."""
+    url = f"{API_BASE}/fetch_query_result"
+    params = {"task_id": task_id}
+    scheduler = scheduler or PollScheduler()
+    delays = scheduler.delays(num_reactions)
+    start_time = time.time()
+    deadline = start_time + timeout
+    
+    while True:
+        time.sleep(min(next(delays), max(0.0, deadline - time.time())))
+        if limiter:
+            limiter.wait()
+        resp = session.get(url, params=params, timeout=30, stream=stream)
+        
+        if resp.status_code == 200:
+            scheduler.observe(num_reactions, time.time() - start_time)
+            return resp
+        
+        
+        elif resp.status_code == 202 or (resp.status_code == 400 and "not ready" in resp.text.lower()):
+            resp.close()
+            if time.time() >= deadline:
+                raise QueryTimeoutError(task_id, timeout)
+            continue
+        
+        resp.raise_for_status() 
+
+
+def fetch_query_result(
+    session: requests.Session,
+    task_id: str,
+    limiter: Optional[RateLimiter] = None,
+    scheduler: Optional[PollScheduler] = None,
+    num_reactions: int = 0,
+    timeout: float = REACTION_TIMEOUT_S
+) -> List[Dict]:
+    """
+    Polls for query results until ready or timeout.
+
+    Raises QueryTimeoutError after `timeout` seconds; calling again with the
+    same task_id resumes polling instead of resubmitting the query.
+    """
+    resp = _poll_until_ready(session, task_id, limiter, scheduler, num_reactions, timeout)
+    try:
+        return resp.json()
+    except json.JSONDecodeError:
+        return []
+
+
+def iter_query_result(
+    session: requests.Session,
+    task_id: str,
+    limiter: Optional[RateLimiter] = None,
+    scheduler: Optional[PollScheduler] = None,
+    num_reactions: int = 0,
+    timeout: float = REACTION_TIMEOUT_S
+) -> Iterator[Dict]:
+    """
+    Streaming variant of fetch_query_result.
+
+    Polling happens eagerly (so QueryTimeoutError surfaces here); the result
+    array is then parsed item by item straight off the socket.
+    """
+    resp = _poll_until_ready(session, task_id, limiter, scheduler, num_reactions, timeout, stream=True)
+    return _iter_response_items(resp, task_id)
+
+
+def _iter_response_items(resp: requests.Response, task_id: str) -> Iterator[Dict]:
+    parser = JsonArrayStreamParser()
+    try:
+        for chunk in resp.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+            yield from parser.feed(chunk)
+        parser.close()
+    except ValueError as e:
+        print(f"Warning: malformed result body for task={task_id}: {e}", file=sys.stderr)
+    finally:
+        resp.close()
+
+
+class AsyncORDClient:
+    """
+    asyncio counterpart of make_session/submit_query/fetch_query_result.
+
+    All requests share one aiohttp connection pool, so hundreds of pending
+    task_ids can be polled from a single event loop. Retries mirror the
+    urllib3 Retry used by make_session: up to 5 attempts on connection errors
+    and 429/5xx responses, exponential backoff and Retry-After support.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 100,
+        limiter: Optional[RateLimiter] = None,
+        total_retries: int = 5,
+        backoff_factor: float = 1.0,
+        stats: Optional[HttpStats] = None
+    ):
+        self.pool_size = pool_size
+        self.limiter = limiter
+        self.stats = stats
+        self.total_retries = total_retries
+        self.backoff_factor = backoff_factor
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncORDClient":
+        try:
+            import aiohttp
+        except ImportError:
+            print("ERROR: aiohttp is not installed. Run 'pip install aiohttp' to use --engine async.", file=sys.stderr)
+            sys.exit(1)
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size),
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={"User-Agent": USER_AGENT, "Accept": "application/json"},
+            trace_configs=[self._trace_config(aiohttp)] if self.stats else None,
+        )
+        return self
+
+    def _trace_config(self, aiohttp):
+        """aiohttp tracing hooks feeding self.stats; one context per attempt."""
+        stats = self.stats
+
+        async def on_request_start(session, ctx, params):
+            ctx.endpoint = HttpStats.endpoint(params.url)
+            ctx.start = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            stats.add(ctx.endpoint, opened=1)
+
+        async def on_connection_reuseconn(session, ctx, params):
+            stats.add(ctx.endpoint, reused=1)
+
+        async def on_request_end(session, ctx, params):
+            stats.add_ttfb(ctx.endpoint, time.perf_counter() - ctx.start)
+
+        async def on_response_chunk_received(session, ctx, params):
+            stats.add(ctx.endpoint, bytes=len(params.chunk))
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_request_end.append(on_request_end)
+        trace.on_response_chunk_received.append(on_response_chunk_received)
+        return trace
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._session.close()
+
+    def _backoff(self, consecutive_errors: int) -> float:
+        """Same schedule as urllib3: no wait on the first retry, then factor * 2^(n-1)."""
+        if consecutive_errors <= 1:
+            return 0.0
+        return min(120.0, self.backoff_factor * (2 ** (consecutive_errors - 1)))
+
+    async def _open(self, url: str, params: Optional[Dict] = None, stream: bool = False):
+        """
+        Performs a GET with retry semantics and returns the open response.
+
+        The caller must release() it. Streamed responses drop the 30s total
+        timeout in favour of a per-read timeout.
+        """
+        import aiohttp
+
+        # Passing timeout=None would disable the session's timeout, so only override it when streaming.
+        request_kwargs = {"timeout": aiohttp.ClientTimeout(total=None, sock_read=30)} if stream else {}
+        for attempt in range(self.total_retries + 1):
+            if self.limiter:
+                await asyncio.sleep(self.limiter.reserve())
+            try:
+                resp = await self._session.get(url, params=params, **request_kwargs)
+                if resp.status not in RETRY_STATUSES or attempt == self.total_retries:
+                    if self.stats:
+                        self.stats.add(HttpStats.endpoint(url), requests=1, retries=attempt)
+                    return resp
+                resp.release()
+                retry_after = resp.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else self._backoff(attempt + 1)
+                if retry_after.isdigit() and self.limiter:
+                    self.limiter.pause(delay)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.total_retries:
+                    if self.stats:
+                        self.stats.add(HttpStats.endpoint(url), requests=1, retries=attempt)
+                    raise
+                delay = self._backoff(attempt + 1)
+            await asyncio.sleep(delay)
+
+    async def _get(self, url: str, params: Optional[Dict] = None) -> Tuple[int, str]:
+        """Performs a GET with retry semantics and returns (status, body text)."""
+        resp = await self._open(url, params)
+        try:
+            return resp.status, await resp.text()
+        finally:
+            resp.release()
+
+    async def get_datasets(self, cache: Optional[ResponseCache] = None) -> List[Dict]:
+        """Fetches the full dataset listing, served from `cache` while fresh (see get_datasets)."""
+        datasets = cache.get("datasets") if cache else None
+        if datasets is not None:
+            return datasets
+        status, body = await self._get(f"{API_BASE}/datasets")
+        _raise_for_status(status, body, "datasets")
+        datasets = json.loads(body)
+        remember_listing(cache, datasets)
+        return datasets
+
+    async def submit_query(self, dataset_id: str, limit: int, offset: int = 0) -> str:
+        """Submits a query to fetch reactions (optionally from `offset`) and returns the task ID."""
+        params = {"dataset_id": dataset_id, "limit": limit}
+        if offset:
+            params["offset"] = offset
+        status, body = await self._get(f"{API_BASE}/submit_query", params)
+        _raise_for_status(status, body, "submit_query")
+        return body.strip().strip('"')
+
+    async def _poll_until_ready(
+        self,
+        task_id: str,
+        scheduler: Optional[PollScheduler],
+        num_reactions: int,
+        timeout: float,
+        stream: bool = False
+    ):
+        """Polls fetch_query_result and returns the first open 200 response."""
+        url = f"{API_BASE}/fetch_query_result"
+        params = {"task_id": task_id}
+        scheduler = scheduler or PollScheduler()
+        delays = scheduler.delays(num_reactions)
+        start_time = time.time()
+        deadline = start_time + timeout
+
+        while True:
+            await asyncio.sleep(min(next(delays), max(0.0, deadline - time.time())))
+            resp = await self._open(url, params, stream=stream)
+
+            if resp.status == 200:
+                scheduler.observe(num_reactions, time.time() - start_time)
+                return resp
+
+            try:
+                body = await resp.text()
+            finally:
+                resp.release()
+            if resp.status == 202 or (resp.status == 400 and "not ready" in body.lower()):
+                if time.time() >= deadline:
+                    raise QueryTimeoutError(task_id, timeout)
+                continue
+
+            _raise_for_status(resp.status, body, "fetch_query_result")
+
+    async def fetch_query_result(
+        self,
+        task_id: str,
+        scheduler: Optional[PollScheduler] = None,
+        num_reactions: int = 0,
+        timeout: float = REACTION_TIMEOUT_S
+    ) -> List[Dict]:
+        """Polls for query results until ready or timeout without blocking the loop."""
+        resp = await self._poll_until_ready(task_id, scheduler, num_reactions, timeout)
+        try:
+            return json.loads(await resp.text())
+        except json.JSONDecodeError:
+            return []
+        finally:
+            resp.release()
+
+    async def iter_query_result(
+        self,
+        task_id: str,
+        scheduler: Optional[PollScheduler] = None,
+        num_reactions: int = 0,
+        timeout: float = REACTION_TIMEOUT_S
+    ) -> AsyncIterator[Dict]:
+        """Streaming variant of fetch_query_result; polls eagerly, then parses items off the socket."""
+        resp = await self._poll_until_ready(task_id, scheduler, num_reactions, timeout, stream=True)
+        return self._iter_response_items(resp, task_id)
+
+    async def _iter_response_items(self, resp, task_id: str) -> AsyncIterator[Dict]:
+        parser = JsonArrayStreamParser()
+        received = 0
+        try:
+            async for chunk in resp.content.iter_chunked(STREAM_CHUNK_BYTES):
+                received += len(chunk)
+                for item in parser.feed(chunk):
+                    yield item
+            parser.close()
+        except ValueError as e:
+            print(f"Warning: malformed result body for task={task_id}: {e}", file=sys.stderr)
+        finally:
+            resp.release()
+            # aiohttp's on_response_chunk_received only fires from read(), so streamed bodies are counted here.
+            if self.stats:
+                self.stats.add(HttpStats.endpoint(resp.url), bytes=received)
+
+
+def _raise_for_status(status: int, body: str, endpoint: str) -> None:
+    """Raises requests.HTTPError for 4xx/5xx so async errors match the sync path."""
+    if status >= 400:
+        raise requests.HTTPError(f"{status} Error for {endpoint}: {body[:200]}")
+
+
+
+class CategoryClassifier:
+    """
+    Maps reaction input keys ("Base", "solvent_1", ...) to component categories.
+
+    Rules are (category, patterns) pairs tried in order and the first
+    substring match wins, so a key like "metal and ligand" always lands in the
+    same bucket. Unmatched keys keep their normalized form. Results are
+    memoized per raw key in a bounded LRU cache.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, Sequence[str]]], cache_size: int = CATEGORY_CACHE_SIZE):
+        self.rules = [(category, tuple(patterns)) for category, patterns in rules]
+        self.categories = tuple(dict.fromkeys(category for category, _ in self.rules))
+        self.classify = functools.lru_cache(maxsize=cache_size)(self._classify)
+
+    @classmethod
+    def default(cls) -> "CategoryClassifier":
+        return cls([(category, [category]) for category in CORE_CATEGORIES])
+
+    @classmethod
+    def from_file(cls, path: str) -> "CategoryClassifier":
+        """
+        Loads ordered rules from JSON:
+
+            [{"category": "ligand", "patterns": ["ligand", "phosphine"]}, ...]
+        """
+        with open(path, encoding="utf-8") as f:
+            rules = json.load(f)
+        return cls([(rule["category"], rule.get("patterns") or [rule["category"]]) for rule in rules])
+
+    def _classify(self, input_key: str) -> str:
+        normalized_key = input_key.strip().lower().replace("_", " ")
+        for category, patterns in self.rules:
+            if any(pattern in normalized_key for pattern in patterns):
+                return category
+        return normalized_key
+
+
+_CLASSIFIER: Optional[CategoryClassifier] = None
+
+
+def get_classifier() -> CategoryClassifier:
+    """Returns the process-wide classifier (CORE_CATEGORIES unless set_category_rules ran)."""
+    global _CLASSIFIER
+    if _CLASSIFIER is None:
+        _CLASSIFIER = CategoryClassifier.default()
+    return _CLASSIFIER
+
+
+def set_category_rules(rules: Optional[Sequence[Tuple[str, Sequence[str]]]]) -> None:
+    """Installs custom category rules; also used as the DecodeStage worker initializer."""
+    global _CLASSIFIER
+    _CLASSIFIER = CategoryClassifier(rules) if rules else None
+
+
+class _SchemaContext:
+    """
+    ord_schema's reaction_pb2 plus the lookup tables extract_reaction_data needs.
+
+    Built once per process on first use, so the per-component hot loop is
+    plain dict lookups instead of an import and an enum-descriptor search.
+    Input-key categories come from the CategoryClassifier.
+    """
+
+    def __init__(self):
+        try:
+            from ord_schema.proto import reaction_pb2
+        except ImportError:
+            print("ERROR: ord-schema is not installed. Run 'pip install ord-schema requests'.", file=sys.stderr)
+            sys.exit(1)
+
+        self.reaction_pb2 = reaction_pb2
+        self.role_names: Dict[int, str] = {
+            value.number: value.name for value in reaction_pb2.ReactionRole.ReactionRoleType.DESCRIPTOR.values
+        }
+
+
+_SCHEMA: Optional[_SchemaContext] = None
+
+
+def get_schema() -> _SchemaContext:
+    """Returns the process-wide schema context, creating it on first use."""
+    global _SCHEMA
+    if _SCHEMA is None:
+        _SCHEMA = _SchemaContext()
+    return _SCHEMA
+
+
+def decode_reaction_proto(proto_b64: str):
+    """Decodes base64-encoded reaction Protocol Buffer data using ord_schema."""
+    rxn = get_schema().reaction_pb2.Reaction()
+    rxn.ParseFromString(base64.b64decode(proto_b64))
+    return rxn
+
+def extract_identifiers(compound) -> str:
+    """Extracts and joins all non-empty compound identifier values."""
+    return "; ".join([ident.value for ident in compound.identifiers if ident.value])
+
+def extract_reaction_data(rxn, dataset_id: str) -> Dict[str, Any]:
+    """
+    Parses a decoded Reaction protobuf object to extract structured data.
+    """
+    role_names = get_schema().role_names
+    classifier = get_classifier()
+    extracted_roles: Dict[str, List[Dict]] = {k: [] for k in classifier.categories}
+    
+    try:
+        outcome_successful = bool(rxn.outcomes) and bool(rxn.outcomes[0].products)
+
+        for input_key, reaction_input in rxn.inputs.items():
+            category = classifier.classify(input_key)
+            bucket = extracted_roles.get(category)
+            if bucket is None:
+                bucket = extracted_roles[category] = []
+
+            for component in reaction_input.components:
+                text_id = extract_identifiers(component)
+                if text_id:
+                    bucket.append({
+                        "value": text_id,
+                        "role": role_names.get(component.reaction_role, "UNKNOWN")
+                    })
+                    
+        return {
+            "dataset_id": dataset_id,
+            "reaction_id": rxn.reaction_id,
+            "components": extracted_roles,
+            "success": outcome_successful
+        }
+    
+    except Exception as e:
+        print(f"Warning: Failed to extract data for reaction {rxn.reaction_id}: {e}", file=sys.stderr)
+        return {
+            "dataset_id": dataset_id,
+            "reaction_id": rxn.reaction_id,
+            "error": str(e)
+        }
+
+
+
+def decode_items(items: Iterable[Dict], dataset_id: str) -> List[Dict]:
+    """Decodes and extracts every reaction proto in a query result."""
+    results: List[Dict] = []
+    for item in items:
+        proto_b64 = item.get("proto")
+        if not proto_b64:
+            continue
+        
+        rxn = decode_reaction_proto(proto_b64)
+        results.append(extract_reaction_data(rxn, dataset_id))
+    return results
+
+
+class DecodeStage:
+    """
+    CPU stage that base64-decodes protos and runs extract_reaction_data.
+
+    With `workers` > 0, query results are split into batches and queued onto a
+    ProcessPoolExecutor, so protobuf parsing runs on other cores while the
+    network threads (or event loop) keep fetching. With `ordered=False`,
+    batches are returned in completion order rather than result order.
+
+    Workers are started by a forkserver (spawn where that is unavailable),
+    never forked from this process, which by then has HTTP threads running.
+    """
+
+    def __init__(self, workers: int = 0, ordered: bool = True, batch_size: int = DECODE_BATCH_SIZE):
+        self.workers = workers
+        self.ordered = ordered
+        self.batch_size = batch_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "DecodeStage":
+        if self.workers > 0:
+            classifier = get_classifier()
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context(method),
+                initializer=set_category_rules, initargs=(classifier.rules,)
+            )
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._pool:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _batches(self, items: List[Dict]) -> List[List[Dict]]:
+        return [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+    def run(self, items: List[Dict], dataset_id: str) -> List[Dict]:
+        """Decodes one query result, blocking the calling thread until done."""
+        if not self._pool:
+            return decode_items(items, dataset_id)
+
+        futures = [self._pool.submit(decode_items, batch, dataset_id) for batch in self._batches(items)]
+        results: List[Dict] = []
+        for future in (futures if self.ordered else as_completed(futures)):
+            results.extend(future.result())
+        return results
+
+    def run_stream(self, items: Iterable[Dict], dataset_id: str) -> List[Dict]:
+        """
+        Decodes items as they are parsed off the wire.
+
+        Without a pool each item is decoded as soon as it arrives; with one, at
+        most `workers` + 1 batches are buffered at a time.
+        """
+        if not self._pool:
+            return decode_items(items, dataset_id)
+
+        results: List[Dict] = []
+        in_flight = deque()
+        iterator = iter(items)
+        for batch in iter(lambda: list(islice(iterator, self.batch_size)), []):
+            in_flight.append(self._pool.submit(decode_items, batch, dataset_id))
+            if len(in_flight) > self.workers:
+                results.extend(in_flight.popleft().result())
+        while in_flight:
+            results.extend(in_flight.popleft().result())
+        return results
+
+    async def run_async_stream(self, items: AsyncIterator[Dict], dataset_id: str) -> List[Dict]:
+        """Async variant of run_stream, fed by an async item iterator."""
+        results: List[Dict] = []
+        batch: List[Dict] = []
+        async for item in items:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                results.extend(await self.run_async(batch, dataset_id))
+                batch = []
+        if batch:
+            results.extend(await self.run_async(batch, dataset_id))
+        return results
+
+    async def run_async(self, items: List[Dict], dataset_id: str) -> List[Dict]:
+        """Decodes one query result without blocking the event loop."""
+        if not self._pool:
+            return decode_items(items, dataset_id)
+
+        futures = [asyncio.wrap_future(self._pool.submit(decode_items, batch, dataset_id)) for batch in self._batches(items)]
+        results: List[Dict] = []
+        for future in (futures if self.ordered else asyncio.as_completed(futures)):
+            results.extend(await future)
+        return results
+
+
+class MemoryWriter:
+    """Collects rows in memory; the original behaviour behind --output_format json."""
+
+    def __init__(self):
+        self.rows: List[Dict] = []
+        self.count = 0
+
+    def write_dataset(self, dataset_id: str, rows: List[Dict]) -> None:
+        self.rows.extend(rows)
+        self.count += len(rows)
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlWriter:
+    """
+    Streams rows to a JSON Lines file, flushing after every dataset so memory stays flat.
+
+    `resume_offset` truncates the file back to the last checkpointed dataset
+    and appends from there, dropping any partially written tail; `append`
+    keeps the existing records (delta runs).
+    """
+
+    def __init__(self, path: str, resume_offset: Optional[int] = None, append: bool = False):
+        self.path = path
+        self.count = 0
+        if resume_offset is not None and os.path.exists(path):
+            if resume_offset < os.path.getsize(path):
+                os.truncate(path, resume_offset)
+            self._fh = open(path, "ab")
+        else:
+            self._fh = open(path, "ab" if append else "wb")
+
+    @property
+    def offset(self) -> int:
+        """Byte offset just past the last flushed dataset."""
+        return self._fh.tell()
+
+    def write_dataset(self, dataset_id: str, rows: List[Dict]) -> None:
+        for row in rows:
+            self._fh.write(json.dumps(row, ensure_ascii=False).encode("utf-8"))
+            self._fh.write(b"\n")
+        self._fh.flush()
+        self.count += len(rows)
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class ParquetExport:
+    """
+    Columnar export of extracted rows as two Parquet tables under `directory`.
+
+    reactions:  dataset_id, reaction_id, success, error
+    components: dataset_id, reaction_id, category, role, value  (exploded)
+
+    Rows are buffered as datasets complete and written out as row groups of
+    about `row_group_rows`. Each run writes its own part file, named with a
+    leading underscore until closed so readers skip unfinished parts.
+
+    With a `run_id` (checkpointed runs), every dataset is finalized into its
+    own part-{run_id}-{dataset_id} file before write_dataset returns, so a
+    dataset the checkpoint records as written is already readable, and one
+    redone after a crash replaces its part instead of duplicating it.
+    """
+
+    REACTION_COLUMNS = ("dataset_id", "reaction_id", "success", "error")
+    COMPONENT_COLUMNS = ("dataset_id", "reaction_id", "category", "role", "value")
+
+    def __init__(self, directory: str, row_group_rows: int = PARQUET_ROW_GROUP_ROWS, run_id: Optional[int] = None):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("ERROR: pyarrow is not installed. Run 'pip install pyarrow' to use --parquet_dir.", file=sys.stderr)
+            sys.exit(1)
+
+        self._pa = pa
+        self._pq = pq
+        self.directory = directory
+        self.row_group_rows = row_group_rows
+        self.run_id = run_id
+        self._schemas = {
+            "reactions": (self.REACTION_COLUMNS, pa.schema(list(zip(
+                self.REACTION_COLUMNS, (pa.string(), pa.string(), pa.bool_(), pa.string())
+            )))),
+            "components": (self.COMPONENT_COLUMNS, pa.schema([(column, pa.string()) for column in self.COMPONENT_COLUMNS])),
+        }
+        for name in self._schemas:
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+        self._tables = {}
+        if run_id is None:
+            self._open_part(f"part-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}.parquet")
+
+    def _open_part(self, part: str) -> None:
+        for name, (columns, schema) in self._schemas.items():
+            table_dir = os.path.join(self.directory, name)
+            tmp_path = os.path.join(table_dir, f"_{part}.inprogress")
+            self._tables[name] = {
+                "columns": columns,
+                "schema": schema,
+                "buffer": {column: [] for column in columns},
+                "writer": self._pq.ParquetWriter(tmp_path, schema),
+                "paths": (tmp_path, os.path.join(table_dir, part)),
+            }
+
+    def _close_part(self) -> None:
+        for name, table in self._tables.items():
+            self._flush(name)
+            table["writer"].close()
+            os.replace(*table["paths"])
+        self._tables = {}
+
+    def write_dataset(self, dataset_id: str, rows: List[Dict]) -> None:
+        if self.run_id is not None:
+            if not rows:
+                return
+            self._open_part(f"part-{self.run_id}-{dataset_id}.parquet")
+        reactions = self._tables["reactions"]["buffer"]
+        components = self._tables["components"]["buffer"]
+        for row in rows:
+            reaction_id = row.get("reaction_id")
+            reactions["dataset_id"].append(row.get("dataset_id", dataset_id))
+            reactions["reaction_id"].append(reaction_id)
+            reactions["success"].append(row.get("success"))
+            reactions["error"].append(row.get("error"))
+            for category, entries in (row.get("components") or {}).items():
+                for entry in entries:
+                    components["dataset_id"].append(row.get("dataset_id", dataset_id))
+                    components["reaction_id"].append(reaction_id)
+                    components["category"].append(category)
+                    components["role"].append(entry.get("role"))
+                    components["value"].append(entry.get("value"))
+        if self.run_id is not None:
+            self._close_part()
+            return
+        for name in self._tables:
+            if len(self._tables[name]["buffer"]["dataset_id"]) >= self.row_group_rows:
+                self._flush(name)
+
+    def _flush(self, name: str) -> None:
+        table = self._tables[name]
+        if not table["buffer"]["dataset_id"]:
+            return
+        batch = self._pa.Table.from_pydict(table["buffer"], schema=table["schema"])
+        table["writer"].write_table(batch, row_group_size=self.row_group_rows)
+        table["buffer"] = {column: [] for column in table["columns"]}
+
+    def close(self) -> None:
+        self._close_part()
+
+
+REACTION_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reactions (
+    reaction_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    dataset_id TEXT,
+    doi TEXT,
+    reaction_smiles TEXT,
+    success INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS components (
+    reaction_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    role TEXT,
+    smiles TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS provenance (
+    reaction_id TEXT NOT NULL,
+    source_url TEXT,
+    extraction_method TEXT,
+    scraped_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reactions_dataset ON reactions (dataset_id);
+CREATE INDEX IF NOT EXISTS reactions_doi ON reactions (doi);
+CREATE INDEX IF NOT EXISTS components_smiles ON components (smiles);
+CREATE INDEX IF NOT EXISTS components_reaction ON components (reaction_id);
+CREATE INDEX IF NOT EXISTS provenance_reaction ON provenance (reaction_id);
+"""
+
+
+class ReactionStore:
+    """
+    Local SQLite store of reactions, their components and where each was seen.
+
+    The schema is shared with the KMT scraper, so both can write into the same
+    file. ORD component values are split into one row per identifier, which
+    makes "which reactions use this ligand" a single indexed lookup. Each
+    dataset is written in one WAL-mode transaction; re-scraped reactions
+    replace their earlier rows and gain another provenance entry.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(REACTION_STORE_SCHEMA)
+
+    def write_dataset(self, dataset_id: str, rows: List[Dict]) -> None:
+        scraped_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        source_url = f"{API_BASE}/dataset/{dataset_id}"
+        reactions, components, provenance = [], [], []
+        for row in rows:
+            reaction_id = row.get("reaction_id")
+            if not reaction_id:
+                continue
+            reactions.append((reaction_id, "ord", row.get("dataset_id", dataset_id), None, None,
+                              row.get("success"), row.get("error")))
+            provenance.append((reaction_id, source_url, "ord-api", scraped_at))
+            for category, entries in (row.get("components") or {}).items():
+                for entry in entries:
+                    for value in entry.get("value", "").split("; "):
+                        if value:
+                            components.append((reaction_id, category, entry.get("role"), value))
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("DELETE FROM components WHERE reaction_id = ?", [(r[0],) for r in reactions])
+                self._conn.executemany("INSERT OR REPLACE INTO reactions VALUES (?, ?, ?, ?, ?, ?, ?)", reactions)
+                self._conn.executemany("INSERT INTO components VALUES (?, ?, ?, ?)", components)
+                self._conn.executemany("INSERT INTO provenance VALUES (?, ?, ?, ?)", provenance)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.count += len(reactions)
+
+    def reactions_with_component(self, smiles: str) -> List[str]:
+        """reaction_ids of every stored reaction with a component exactly matching `smiles`."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT reaction_id FROM components WHERE smiles = ?", (smiles,)
+            )]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class TeeWriter:
+    """Fans each finished dataset out to several writers; attributes come from the first (primary)."""
+
+    def __init__(self, writers: List[Any]):
+        self.writers = writers
+
+    def write_dataset(self, dataset_id: str, rows: List[Dict]) -> None:
+        for writer in self.writers:
+            writer.write_dataset(dataset_id, rows)
+
+    def close(self) -> None:
+        for writer in self.writers:
+            writer.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self.writers[0], name)
+
+
+class MergingWriter:
+    """Forwards rows to `writer`, dropping any whose reaction_id is already in the output store."""
+
+    def __init__(self, writer, known_ids: set):
+        self.writer = writer
+        self.known_ids = known_ids
+
+    def write_dataset(self, dataset_id: str, rows: List[Dict]) -> None:
+        fresh = [row for row in rows if row.get("reaction_id") not in self.known_ids]
+        self.known_ids.update(row["reaction_id"] for row in fresh if row.get("reaction_id"))
+        self.writer.write_dataset(dataset_id, fresh)
+
+    def __getattr__(self, name: str):
+        return getattr(self.writer, name)
+
+
+def load_records(path: str) -> List[Dict]:
+    """Reads a previous output file, either a JSON array or JSON Lines."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def load_reaction_ids(path: str) -> set:
+    """Collects the reaction_ids already present in a previous output file."""
+    ids = set()
+    if not os.path.exists(path):
+        return ids
+    with open(path, encoding="utf-8") as f:
+        rows = (json.loads(line) for line in f if line.strip()) if path.endswith(".jsonl") else json.load(f)
+        for row in rows:
+            if row.get("reaction_id"):
+                ids.add(row["reaction_id"])
+    return ids
+
+
+def load_snapshot(path: str) -> Dict[str, int]:
+    """Loads a {dataset_id: num_reactions} snapshot of a previous listing ({} if absent)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_snapshot(path: str, snapshot: Dict[str, int]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def diff_listing(datasets: List[Dict], snapshot: Dict[str, int]) -> List[Dict]:
+    """Keeps only datasets that are new or have grown since `snapshot` was taken."""
+    return [
+        d for d in datasets
+        if d.get("num_reactions", 0) > snapshot.get(d.get("dataset_id"), -1)
+    ]
+
+
+class ScrapeCheckpoint:
+    """
+    SQLite record of scrape progress so an interrupted run can be resumed.
+
+    One row per dataset: its status ("submitted", "done" or "failed"), the
+    task_id of a query still in flight, and the JSONL output offset after the
+    dataset was written (done datasets only; a failed one is retried on
+    resume and has nothing in the output to keep). The run table keeps the run's id and the output
+    size when it started, so a delta run that appends to earlier output
+    never resumes below it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS datasets (
+                dataset_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                task_id TEXT,
+                output_offset INTEGER,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS run (key TEXT PRIMARY KEY, value INTEGER)")
+
+    def _upsert(self, dataset_id: str, status: str, task_id: Optional[str], offset: Optional[int]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO datasets VALUES (?, ?, ?, ?, ?)",
+                (dataset_id, status, task_id, offset, time.time()),
+            )
+
+    def reset(self, base_offset: int = 0) -> None:
+        """Forgets all progress (a fresh, non-resumed run) whose output starts at `base_offset`."""
+        with self._lock:
+            self._conn.execute("DELETE FROM datasets")
+            self._conn.execute("INSERT OR REPLACE INTO run VALUES ('base_offset', ?)", (base_offset,))
+            self._conn.execute("INSERT OR REPLACE INTO run VALUES ('run_id', ?)", (int(time.time()),))
+
+    def run_id(self) -> int:
+        """Identifies the run across resumes (its start time); created on first use."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM run WHERE key = 'run_id'").fetchone()
+            if row:
+                return row[0]
+            run_id = int(time.time())
+            self._conn.execute("INSERT INTO run VALUES ('run_id', ?)", (run_id,))
+            return run_id
+
+    def completed(self) -> set:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT dataset_id FROM datasets WHERE status = 'done'")}
+
+    def pending_task(self, dataset_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT task_id FROM datasets WHERE dataset_id = ? AND status = 'submitted'", (dataset_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def output_offset(self) -> int:
+        """Offset in the JSONL output up to which every record is accounted for."""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(output_offset) FROM datasets WHERE status = 'done'").fetchone()
+            base = self._conn.execute("SELECT value FROM run WHERE key = 'base_offset'").fetchone()
+        return max(row[0] or 0, base[0] if base else 0)
+
+    def mark_submitted(self, dataset_id: str, task_id: str) -> None:
+        self._upsert(dataset_id, "submitted", task_id, None)
+
+    def mark_written(self, dataset_id: str, ok: bool, offset: Optional[int]) -> None:
+        self._upsert(dataset_id, "done" if ok else "failed", None, offset if ok else None)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class DatasetEmitter:
+    """
+    Hands finished datasets to a writer, holding them back to restore listing
+    order when `ordered`, and records each write in the checkpoint if given.
+
+    With a checkpoint, a failed dataset's error row is recorded there instead
+    of being written, so the retry on resume does not land after a stale one.
+    """
+
+    def __init__(self, writer, ordered: bool = True, checkpoint: Optional[ScrapeCheckpoint] = None):
+        self.writer = writer
+        self.ordered = ordered
+        self.checkpoint = checkpoint
+        self._next_index = 0
+        self._held: Dict[int, Tuple[str, List[Dict], bool]] = {}
+
+    def finish(self, index: int, dataset_id: str, rows: List[Dict], ok: bool = True) -> None:
+        if not self.ordered:
+            self._write(dataset_id, rows, ok)
+            return
+
+        self._held[index] = (dataset_id, rows, ok)
+        while self._next_index in self._held:
+            self._write(*self._held.pop(self._next_index))
+            self._next_index += 1
+
+    def _write(self, dataset_id: str, rows: List[Dict], ok: bool) -> None:
+        if ok or not self.checkpoint:
+            self.writer.write_dataset(dataset_id, rows)
+        if self.checkpoint:
+            self.checkpoint.mark_written(dataset_id, ok, getattr(self.writer, "offset", None))
 
-def fetch_query_result(session: requests.Session, task_id: str) -> List[Dict]:
-    """Polls for query results until ready or timeout."""
-    url = f"{API_BASE}/fetch_query_result"
-    params = {"task_id": task_id}
-    start_time = time.time()
-    
-    while time.time() - start_time < REACTION_TIMEOUT_S:
-        resp = session.get(url, params=params, timeout=30)
-        
-        if resp.status_code == 200:
-            try:
-                return resp.json()
-            except json.JSONDecodeError:
-                return []
-        
-        
-        elif resp.status_code == 202:
-            time.sleep(2.0)
-            continue
-        
-        
-        elif resp.status_code == 400 and "not ready" in resp.text.lower():
-            time.sleep(2.0)
-            continue
-        
-        resp.raise_for_status() 
 
-    raise TimeoutError(f"Query result for task={task_id} timed out after {REACTION_TIMEOUT_S}s.")
+def jsonl_to_json_array(jsonl_path: str, json_path: str) -> int:
+    """Rewrites a JSON Lines file as the pretty JSON array format, one record at a time."""
+    count = 0
+    with open(jsonl_path, encoding="utf-8") as src, open(json_path, "w", encoding="utf-8") as dst:
+        dst.write("[")
+        for line in src:
+            if not line.strip():
+                continue
+            record = json.dumps(json.loads(line), ensure_ascii=False, indent=2)
+            dst.write(",\n  " if count else "\n  ")
+            dst.write(record.replace("\n", "\n  "))
+            count += 1
+        dst.write("\n]" if count else "]")
+    return count
 
 
+def resume_poll(dataset_id: str, task_id: str, attempt: int, poll_resumes: int) -> bool:
+    """After a QueryTimeoutError on poll `attempt`: whether to resume polling (and say so) or give up."""
+    if attempt == poll_resumes:
+        return False
+    print(f"  -> {dataset_id}: task {task_id} still running, resuming poll ({attempt + 1}/{poll_resumes})", file=sys.stderr)
+    return True
 
-def decode_reaction_proto(proto_b64: str):
-    """Decodes base64-encoded reaction Protocol Buffer data using ord_schema."""
-    try:
-        from ord_schema.proto import reaction_pb2
-    except ImportError:
-        print("ERROR: ord-schema is not installed. Run 'pip install ord-schema requests'.", file=sys.stderr)
-        sys.exit(1)
-        
-    raw = base64.b64decode(proto_b64)
-    rxn = reaction_pb2.Reaction()
-    rxn.ParseFromString(raw)
-    return rxn
 
-def extract_identifiers(compound) -> str:
-    """Extracts and joins all non-empty compound identifier values."""
-    texts = []
-    for ident in compound.identifiers:
-        if ident.value:
-            texts.append(ident.value)
-    return "; ".join(texts)
+def poll_task(
+    session: requests.Session,
+    dataset_id: str,
+    task_id: str,
+    num_reactions: int,
+    limiter: Optional[RateLimiter] = None,
+    scheduler: Optional[PollScheduler] = None,
+    poll_timeout: float = REACTION_TIMEOUT_S,
+    poll_resumes: int = POLL_RESUMES,
+    stream: bool = False
+) -> Iterable[Dict]:
+    """
+    Polls an existing task_id, resuming after QueryTimeoutError up to `poll_resumes` times.
 
-def extract_reaction_data(rxn, dataset_id: str) -> Dict[str, Any]:
+    With `stream`, returns a lazy item iterator (see iter_query_result) instead of a list.
     """
-    Parses a decoded Reaction protobuf object to extract structured data.
+    fetch = iter_query_result if stream else fetch_query_result
+    for attempt in range(poll_resumes + 1):
+        try:
+            return fetch(
+                session, task_id, limiter=limiter, scheduler=scheduler,
+                num_reactions=num_reactions, timeout=poll_timeout
+            )
+        except QueryTimeoutError:
+            if not resume_poll(dataset_id, task_id, attempt, poll_resumes):
+                raise
+
+
+def chunk_windows(total: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """Splits `total` reactions into (offset, limit) windows of at most `chunk_size`."""
+    return [(offset, min(chunk_size, total - offset)) for offset in range(0, total, chunk_size)]
+
+
+class ChunkDeduper:
     """
-    extracted_roles: Dict[str, List[Dict]] = {k: [] for k in CORE_CATEGORIES}
-    
-    try:
-        
-        outcome_successful = False
-        if rxn.outcomes and rxn.outcomes[0].reaction_product:
-            outcome_successful = True 
+    Checks that the chunks of one dataset do not overlap.
 
-        
-        for input_key, reaction_input in rxn.inputs.items():
-            normalized_key = input_key.strip().lower().replace("_", " ")
+    Keeps 16-byte digests of each proto rather than the strings. Any item
+    already seen in another chunk means the server ignored `offset` (windows
+    finish in any order, so the overlap may be partial); that raises
+    OffsetIgnoredError rather than silently truncating the dataset.
+    Repeats within a single chunk are dropped.
+    """
 
-            for component in reaction_input.components:
-                text_id = extract_identifiers(component)
-                
-                if not text_id:
-                    continue
-                
-                
-                try:
-                    from ord_schema.proto import reaction_pb2
-                    role_name = reaction_pb2.ReactionRole.Name(component.reaction_role)
-                except Exception:
-                    role_name = "UNKNOWN"
-
-                comp_data = {
-                    "value": text_id,
-                    "role": role_name
-                }
-                
-                
-                assigned = False
-                for core_key in CORE_CATEGORIES:
-                    if core_key in normalized_key:
-                        extracted_roles[core_key].append(comp_data)
-                        assigned = True
-                        break
-                
-                
-                if not assigned:
-                    extracted_roles.setdefault(normalized_key, []).append(comp_data)
-                    
-        return {
-            "dataset_id": dataset_id,
-            "reaction_id": rxn.reaction_id.value,
-            "components": extracted_roles,
-            "success": outcome_successful
-        }
-    
-    except Exception as e:
-        print(f"Warning: Failed to extract data for reaction {rxn.reaction_id.value}: {e}", file=sys.stderr)
-        return {
-            "dataset_id": dataset_id,
-            "reaction_id": rxn.reaction_id.value,
-            "error": str(e)
-        }
+    def __init__(self, dataset_id: str):
+        self.dataset_id = dataset_id
+        self._seen = set()
 
+    def filter(self, items: List[Dict]) -> List[Dict]:
+        digests = [hashlib.blake2b(item.get("proto", "").encode("utf-8"), digest_size=16).digest() for item in items]
+        if not self._seen.isdisjoint(digests):
+            raise OffsetIgnoredError(f"{self.dataset_id}: chunks overlap; the server is ignoring offset")
+        fresh = []
+        for item, digest in zip(items, digests):
+            if digest not in self._seen:
+                self._seen.add(digest)
+                fresh.append(item)
+        return fresh
 
 
-def scrape_ord_advanced(
-    max_datasets: Optional[int],
+class ChunkedFetch:
+    """
+    Engine-independent bookkeeping for fetching one dataset as offset windows:
+    the windows, their cache entries, the retry decision, the overlap check
+    and reassembly in offset order. The engines only schedule the requests.
+    """
+
+    def __init__(self, ds: Dict, total: int, chunk_size: int, cache: Optional[ResponseCache] = None):
+        self.dataset_id = ds.get("dataset_id")
+        self.num_rxns = ds.get("num_reactions", 0)
+        self.cache = cache
+        self.windows = chunk_windows(total, chunk_size)
+        self._deduper = ChunkDeduper(self.dataset_id)
+        self._rows_by_offset: Dict[int, List[Dict]] = {}
+        print(f"  -> {self.dataset_id}: fetching {total} reactions as {len(self.windows)} chunks of <= {chunk_size}", file=sys.stderr)
+
+    def _params(self, offset: int, limit: int) -> Dict:
+        return {"dataset_id": self.dataset_id, "limit": limit, "offset": offset}
+
+    def cached(self, offset: int, limit: int) -> Optional[List[Dict]]:
+        return self.cache.get("submit_query", self._params(offset, limit), version=self.num_rxns) if self.cache else None
+
+    def store(self, offset: int, limit: int, items: List[Dict]) -> None:
+        if self.cache:
+            self.cache.put("submit_query", self._params(offset, limit), items, dataset_id=self.dataset_id, version=self.num_rxns)
+
+    def should_retry(self, offset: int, attempt: int, error: Exception) -> bool:
+        """After a failed window request: whether to try again (up to CHUNK_RETRIES times)."""
+        if attempt == CHUNK_RETRIES:
+            return False
+        print(f"  -> {self.dataset_id}: chunk at offset {offset} failed ({error}), retrying", file=sys.stderr)
+        return True
+
+    def accept(self, items: List[Dict]) -> List[Dict]:
+        """Checks a finished window against the others; raises OffsetIgnoredError on overlap."""
+        return self._deduper.filter(items)
+
+    def add_rows(self, offset: int, rows: List[Dict]) -> None:
+        self._rows_by_offset[offset] = rows
+
+    def rows(self) -> List[Dict]:
+        rows: List[Dict] = []
+        for offset in sorted(self._rows_by_offset):
+            rows.extend(self._rows_by_offset.pop(offset))
+        return rows
+
+
+def process_dataset_chunked(
+    session: requests.Session,
+    ds: Dict,
+    total: int,
+    chunk_size: int,
+    chunk_workers: int = CHUNK_WORKERS,
+    limiter: Optional[RateLimiter] = None,
+    scheduler: Optional[PollScheduler] = None,
+    poll_timeout: float = REACTION_TIMEOUT_S,
+    poll_resumes: int = POLL_RESUMES,
+    decoder: Optional[DecodeStage] = None,
+    cache: Optional[ResponseCache] = None
+) -> List[Dict]:
+    """
+    Fetches a large dataset as parallel (offset, limit) windows.
+
+    Each window is its own small query task, retried up to CHUNK_RETRIES
+    times and decoded as soon as it arrives, so no single response holds the
+    whole dataset. Rows are reassembled in offset order. Raises
+    OffsetIgnoredError if windows overlap (see ChunkDeduper).
+    """
+    fetch = ChunkedFetch(ds, total, chunk_size, cache)
+    dataset_id = fetch.dataset_id
+
+    def fetch_window(offset: int, limit: int) -> List[Dict]:
+        items = fetch.cached(offset, limit)
+        if items is not None:
+            return items
+        for attempt in range(CHUNK_RETRIES + 1):
+            try:
+                task_id = submit_query(session, dataset_id, limit=limit, limiter=limiter, offset=offset)
+                items = poll_task(session, dataset_id, task_id, limit, limiter, scheduler, poll_timeout, poll_resumes)
+                break
+            except (requests.RequestException, TimeoutError) as e:
+                if not fetch.should_retry(offset, attempt, e):
+                    raise
+        fetch.store(offset, limit, items)
+        return items
+
+    with ThreadPoolExecutor(max_workers=max(1, chunk_workers), thread_name_prefix="ord-chunk") as pool:
+        futures = {pool.submit(fetch_window, offset, limit): offset for offset, limit in fetch.windows}
+        try:
+            for future in as_completed(futures):
+                items = fetch.accept(future.result())
+                fetch.add_rows(futures[future], decoder.run(items, dataset_id) if decoder else decode_items(items, dataset_id))
+        except OffsetIgnoredError:
+            for future in futures:
+                future.cancel()
+            raise
+    return fetch.rows()
+
+
+class DatasetQuery:
+    """
+    Engine-independent decisions for one dataset's unchunked query: whether
+    the cache already holds the result, whether the checkpoint has a task to
+    re-attach to, whether to stream, and recording submissions and results.
+    The engines only submit and poll.
+    """
+
+    def __init__(
+        self,
+        ds: Dict,
+        per_dataset_limit: int,
+        checkpoint: Optional["ScrapeCheckpoint"] = None,
+        cache: Optional[ResponseCache] = None,
+        stream_parse: bool = False
+    ):
+        self.dataset_id = ds.get("dataset_id")
+        self.num_rxns = ds.get("num_reactions", 0)
+        self.limit = per_dataset_limit if per_dataset_limit > 0 else self.num_rxns
+        self.checkpoint = checkpoint
+        self.cache = cache
+        self.stream_parse = stream_parse
+        self.items: Optional[List[Dict]] = None
+        self.stream = False
+        self.pending_task: Optional[str] = None
+
+    def chunked(self, chunk_size: int) -> bool:
+        return bool(chunk_size) and self.limit > chunk_size
+
+    def chunks_failed(self, error: OffsetIgnoredError) -> None:
+        print(f"  -> {error}; refetching as one query", file=sys.stderr)
+
+    def _params(self) -> Dict:
+        return {"dataset_id": self.dataset_id, "limit": self.limit}
+
+    def plan(self) -> None:
+        """Looks up the cache, then the checkpoint; sets `items`, `stream` and `pending_task`."""
+        self.items = self.cache.get("submit_query", self._params(), version=self.num_rxns) if self.cache else None
+        cached = self.items is not None
+        if cached:
+            print(f"  -> {self.dataset_id}: served {len(self.items)} reactions from cache", file=sys.stderr)
+        self.stream = self.stream_parse and not cached
+        self.pending_task = self.checkpoint.pending_task(self.dataset_id) if self.checkpoint and not cached else None
+        if self.pending_task:
+            print(f"  -> {self.dataset_id}: re-attaching to task {self.pending_task}", file=sys.stderr)
+
+    def task_gone(self, error: Exception) -> None:
+        print(f"  -> {self.dataset_id}: task {self.pending_task} is gone ({error}), resubmitting", file=sys.stderr)
+
+    def submitted(self, task_id: str) -> None:
+        if self.checkpoint:
+            self.checkpoint.mark_submitted(self.dataset_id, task_id)
+
+    def streamed(self, rows: List[Dict]) -> List[Dict]:
+        print(f"  -> {self.dataset_id}: Streamed and parsed {len(rows)} reactions.", file=sys.stderr)
+        return rows
+
+    def received(self, items: List[Dict]) -> List[Dict]:
+        """Caches a freshly fetched result; returns the items to decode."""
+        if self.cache and items is not self.items:
+            self.cache.put("submit_query", self._params(), items, dataset_id=self.dataset_id, version=self.num_rxns)
+        print(f"  -> {self.dataset_id}: Retrieved {len(items)} reactions for parsing.", file=sys.stderr)
+        return items
+
+
+def process_dataset(
+    session: requests.Session,
+    ds: Dict,
     per_dataset_limit: int,
-    dataset_ids: Optional[List[str]]
+    limiter: Optional[RateLimiter] = None,
+    scheduler: Optional[PollScheduler] = None,
+    poll_timeout: float = REACTION_TIMEOUT_S,
+    poll_resumes: int = POLL_RESUMES,
+    decoder: Optional[DecodeStage] = None,
+    checkpoint: Optional["ScrapeCheckpoint"] = None,
+    cache: Optional[ResponseCache] = None,
+    chunk_size: int = 0,
+    chunk_workers: int = CHUNK_WORKERS,
+    stream_parse: bool = False
 ) -> List[Dict]:
-    """Coordinates the entire scraping process."""
-    session = make_session()
-    all_results: List[Dict] = []
-    processed_count = 0
+    """
+    Runs submit, poll and decode for a single dataset and returns its rows.
+
+    Datasets larger than a non-zero `chunk_size` are handed to
+    process_dataset_chunked instead of being fetched as one task, falling
+    back to one task if the server turns out to ignore `offset`.
+
+    Query results are served from `cache` when the dataset's num_reactions
+    is unchanged. If `checkpoint` holds an in-flight task_id for the dataset,
+    polling re-attaches to it and only resubmits when the server no longer
+    knows it. With `stream_parse`, the result body is parsed and decoded item
+    by item as it downloads (such results are not written to the cache).
+    """
+    query = DatasetQuery(ds, per_dataset_limit, checkpoint, cache, stream_parse)
+    poll_args = (limiter, scheduler, poll_timeout, poll_resumes)
     
-    print("Fetching list of all datasets...", file=sys.stderr)
-    datasets = session.get(f"{API_BASE}/datasets", timeout=30).json()
+    if query.chunked(chunk_size):
+        try:
+            return process_dataset_chunked(
+                session, ds, query.limit, chunk_size, chunk_workers, *poll_args, decoder=decoder, cache=cache
+            )
+        except OffsetIgnoredError as e:
+            query.chunks_failed(e)
     
-    if dataset_ids:
-        
-        datasets = [d for d in datasets if d.get("dataset_id") in dataset_ids]
+    query.plan()
+    items = query.items
+    if query.pending_task:
+        try:
+            items = poll_task(session, query.dataset_id, query.pending_task, query.limit, *poll_args, stream=query.stream)
+        except requests.HTTPError as e:
+            query.task_gone(e)
     
-    print(f"Found {len(datasets)} datasets matching criteria.", file=sys.stderr)
+    if items is None:
+        task_id = submit_query(session, query.dataset_id, limit=query.limit, limiter=limiter)
+        query.submitted(task_id)
+        items = poll_task(session, query.dataset_id, task_id, query.limit, *poll_args, stream=query.stream)
+    
+    if query.stream:
+        return query.streamed(decoder.run_stream(items, query.dataset_id) if decoder else decode_items(items, query.dataset_id))
+    items = query.received(items)
+    return decoder.run(items, query.dataset_id) if decoder else decode_items(items, query.dataset_id)
 
-    for ds in datasets:
-        dataset_id = ds.get("dataset_id")
-        num_rxns = ds.get("num_reactions", 0)
-        
-        if max_datasets is not None and processed_count >= max_datasets:
-            break
+
+class DatasetWindow:
+    """
+    Engine-independent dispatch of datasets: keeps up to `concurrency` in
+    flight (failed datasets do not count towards `max_datasets`), and hands
+    each finished one to the emitter, updating `snapshot` on success or
+    writing an error row on failure. In-flight handles are the engine's
+    futures or tasks; anything with result() works.
+    """
+
+    def __init__(
+        self,
+        datasets: List[Dict],
+        concurrency: int,
+        max_datasets: Optional[int],
+        emitter: DatasetEmitter,
+        snapshot: Optional[Dict[str, int]] = None
+    ):
+        self.concurrency = max(1, concurrency)
+        self.max_datasets = max_datasets
+        self.emitter = emitter
+        self.snapshot = snapshot
+        self.pending: Dict[Any, Tuple[int, Dict]] = {}
+        self.processed_count = 0
+        self._queue = iter(enumerate(datasets))
+        self._exhausted = False
+
+    def refill(self, start) -> bool:
+        """Starts datasets with `start(ds)` until the window is full; returns whether any are in flight."""
+        while not self._exhausted and len(self.pending) < self.concurrency:
+            if self.max_datasets is not None and self.processed_count + len(self.pending) >= self.max_datasets:
+                break
+            try:
+                index, ds = next(self._queue)
+            except StopIteration:
+                self._exhausted = True
+                break
             
-        print(f"\n[{processed_count + 1}] Processing: {dataset_id} ({num_rxns} total reactions)", file=sys.stderr)
-        
+            print(f"\n[{index + 1}] Processing: {ds.get('dataset_id')} ({ds.get('num_reactions', 0)} total reactions)", file=sys.stderr)
+            self.pending[start(ds)] = (index, ds)
+        return bool(self.pending)
+
+    def finish(self, handle) -> None:
+        index, ds = self.pending.pop(handle)
+        dataset_id = ds.get("dataset_id")
         try:
-            effective_limit = per_dataset_limit if per_dataset_limit > 0 else num_rxns
-            
-            task_id = submit_query(session, dataset_id, limit=effective_limit)
-            items = fetch_query_result(session, task_id)
-            
-            print(f"  -> Retrieved {len(items)} reactions for parsing.", file=sys.stderr)
-            
-            for item in items:
-                proto_b64 = item.get("proto")
-                if not proto_b64:
-                    continue
-                
-                rxn = decode_reaction_proto(proto_b64)
-                data = extract_reaction_data(rxn, dataset_id)
-                all_results.append(data)
-                
-            processed_count += 1
-            
+            self.emitter.finish(index, dataset_id, handle.result())
+            self.processed_count += 1
+            if self.snapshot is not None:
+                self.snapshot[dataset_id] = ds.get("num_reactions", 0)
         except Exception as e:
             print(f"  -> ERROR during dataset {dataset_id} processing: {e}", file=sys.stderr)
-            all_results.append({"dataset_id": dataset_id, "error": str(e)})
-            
-        
-        time.sleep(1.0) 
-        
-    return all_results
+            self.emitter.finish(index, dataset_id, [{"dataset_id": dataset_id, "error": str(e)}], ok=False)
+
+
+def scrape_ord_advanced(
+    max_datasets: Optional[int],
+    per_dataset_limit: int,
+    dataset_ids: Optional[List[str]],
+    concurrency: int = 1,
+    rate: float = 2.0,
+    burst: int = 1,
+    poll_timeout: float = REACTION_TIMEOUT_S,
+    poll_resumes: int = POLL_RESUMES,
+    decode_workers: int = 0,
+    ordered: bool = True,
+    writer=None,
+    checkpoint: Optional[ScrapeCheckpoint] = None,
+    cache: Optional[ResponseCache] = None,
+    snapshot: Optional[Dict[str, int]] = None,
+    chunk_size: int = 0,
+    chunk_workers: int = CHUNK_WORKERS,
+    stream_parse: bool = False,
+    pool_size: int = 0,
+    http_stats: Optional[HttpStats] = None
+) -> List[Dict]:
+    """
+    Coordinates the entire scraping process.
+
+    Up to `concurrency` datasets are kept in flight at once, so queries for
+    upcoming datasets are submitted while earlier tasks are still computing
+    server-side. Every API request goes through one shared RateLimiter (a
+    token bucket of `rate` requests/sec and size `burst`) instead of
+    sleeping after each dataset.
+
+    With `decode_workers` > 0, protobuf decoding runs in a process pool
+    (see DecodeStage). With `ordered=False`, rows are emitted in completion
+    order instead of dataset-listing order.
+
+    Rows go to `writer` (e.g. JsonlWriter) as each dataset finishes; without
+    one they are collected and returned as a list. With `checkpoint`, datasets
+    already marked done are skipped and in-flight task_ids are re-attached.
+    `cache` (a ResponseCache) serves unchanged datasets without network calls.
+
+    With `snapshot` ({dataset_id: num_reactions} from a previous run), only
+    added or grown datasets are queried, and the snapshot is updated in place
+    for every dataset that completes. Datasets larger than a non-zero
+    `chunk_size` are fetched as parallel offset windows. `stream_parse`
+    parses result bodies incrementally instead of materializing them.
+
+    `pool_size` keep-alive connections are pooled (0 sizes the pool for
+    `concurrency` and `chunk_workers`); `http_stats` records every request.
+    """
+    concurrency = max(1, concurrency)
+    limiter = RateLimiter(rate, burst)
+    session = make_session(
+        pool_maxsize=pool_size or pool_size_for(concurrency, chunk_size, chunk_workers),
+        stats=http_stats,
+        limiter=limiter
+    )
+    scheduler = PollScheduler()
+    collector = MemoryWriter() if writer is None else None
+    emitter = DatasetEmitter(writer or collector, ordered, checkpoint)
+    
+    print("Fetching list of all datasets...", file=sys.stderr)
+    datasets = select_datasets(get_datasets(session, limiter, cache), dataset_ids, snapshot, checkpoint)
+    window = DatasetWindow(datasets, concurrency, max_datasets, emitter, snapshot)
+
+    with DecodeStage(workers=decode_workers, ordered=ordered) as decoder, \
+            ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ord-dataset") as pool:
+        def start(ds: Dict) -> Future:
+            return pool.submit(
+                process_dataset, session, ds, per_dataset_limit, limiter, scheduler,
+                poll_timeout, poll_resumes, decoder, checkpoint, cache, chunk_size, chunk_workers,
+                stream_parse
+            )
+
+        while window.refill(start):
+            done, _ = wait(window.pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                window.finish(future)
+
+    return collector.rows if collector else []
+
+
+
+async def poll_task_async(
+    client: AsyncORDClient,
+    dataset_id: str,
+    task_id: str,
+    num_reactions: int,
+    scheduler: Optional[PollScheduler] = None,
+    poll_timeout: float = REACTION_TIMEOUT_S,
+    poll_resumes: int = POLL_RESUMES,
+    stream: bool = False
+):
+    """Async variant of poll_task; with `stream`, returns an async item iterator."""
+    fetch = client.iter_query_result if stream else client.fetch_query_result
+    for attempt in range(poll_resumes + 1):
+        try:
+            return await fetch(
+                task_id, scheduler=scheduler, num_reactions=num_reactions, timeout=poll_timeout
+            )
+        except QueryTimeoutError:
+            if not resume_poll(dataset_id, task_id, attempt, poll_resumes):
+                raise
+
+
+async def process_dataset_chunked_async(
+    client: AsyncORDClient,
+    ds: Dict,
+    total: int,
+    chunk_size: int,
+    chunk_workers: int = CHUNK_WORKERS,
+    scheduler: Optional[PollScheduler] = None,
+    poll_timeout: float = REACTION_TIMEOUT_S,
+    poll_resumes: int = POLL_RESUMES,
+    decoder: Optional[DecodeStage] = None,
+    cache: Optional[ResponseCache] = None
+) -> List[Dict]:
+    """Async variant of process_dataset_chunked; `chunk_workers` bounds windows in flight."""
+    fetch = ChunkedFetch(ds, total, chunk_size, cache)
+    dataset_id = fetch.dataset_id
+    slots = asyncio.Semaphore(max(1, chunk_workers))
+
+    async def fetch_window(offset: int, limit: int) -> Tuple[int, List[Dict]]:
+        items = fetch.cached(offset, limit)
+        if items is not None:
+            return offset, items
+        async with slots:
+            for attempt in range(CHUNK_RETRIES + 1):
+                try:
+                    task_id = await client.submit_query(dataset_id, limit=limit, offset=offset)
+                    items = await poll_task_async(client, dataset_id, task_id, limit, scheduler, poll_timeout, poll_resumes)
+                    break
+                except (requests.RequestException, TimeoutError) as e:
+                    if not fetch.should_retry(offset, attempt, e):
+                        raise
+        fetch.store(offset, limit, items)
+        return offset, items
+
+    tasks = [asyncio.ensure_future(fetch_window(offset, limit)) for offset, limit in fetch.windows]
+    try:
+        for next_window in asyncio.as_completed(tasks):
+            offset, items = await next_window
+            items = fetch.accept(items)
+            fetch.add_rows(offset, await decoder.run_async(items, dataset_id) if decoder else decode_items(items, dataset_id))
+    except OffsetIgnoredError:
+        for task in tasks:
+            task.cancel()
+        raise
+    return fetch.rows()
+
+
+async def process_dataset_async(
+    client: AsyncORDClient,
+    ds: Dict,
+    per_dataset_limit: int,
+    scheduler: Optional[PollScheduler] = None,
+    poll_timeout: float = REACTION_TIMEOUT_S,
+    poll_resumes: int = POLL_RESUMES,
+    decoder: Optional[DecodeStage] = None,
+    checkpoint: Optional["ScrapeCheckpoint"] = None,
+    cache: Optional[ResponseCache] = None,
+    chunk_size: int = 0,
+    chunk_workers: int = CHUNK_WORKERS,
+    stream_parse: bool = False
+) -> List[Dict]:
+    """Async variant of process_dataset sharing the client's connection pool."""
+    query = DatasetQuery(ds, per_dataset_limit, checkpoint, cache, stream_parse)
+    poll_args = (scheduler, poll_timeout, poll_resumes)
+
+    if query.chunked(chunk_size):
+        try:
+            return await process_dataset_chunked_async(
+                client, ds, query.limit, chunk_size, chunk_workers, *poll_args, decoder=decoder, cache=cache
+            )
+        except OffsetIgnoredError as e:
+            query.chunks_failed(e)
+
+    query.plan()
+    items = query.items
+    if query.pending_task:
+        try:
+            items = await poll_task_async(client, query.dataset_id, query.pending_task, query.limit, *poll_args, stream=query.stream)
+        except requests.HTTPError as e:
+            query.task_gone(e)
+
+    if items is None:
+        task_id = await client.submit_query(query.dataset_id, limit=query.limit)
+        query.submitted(task_id)
+        items = await poll_task_async(client, query.dataset_id, task_id, query.limit, *poll_args, stream=query.stream)
+
+    if query.stream:
+        return query.streamed(await (decoder or DecodeStage()).run_async_stream(items, query.dataset_id))
+    items = query.received(items)
+    if decoder:
+        return await decoder.run_async(items, query.dataset_id)
+    return decode_items(items, query.dataset_id)
+
+
+async def scrape_ord_async(
+    max_datasets: Optional[int],
+    per_dataset_limit: int,
+    dataset_ids: Optional[List[str]],
+    concurrency: int = 100,
+    rate: float = 2.0,
+    burst: int = 1,
+    poll_timeout: float = REACTION_TIMEOUT_S,
+    poll_resumes: int = POLL_RESUMES,
+    decode_workers: int = 0,
+    ordered: bool = True,
+    writer=None,
+    checkpoint: Optional[ScrapeCheckpoint] = None,
+    cache: Optional[ResponseCache] = None,
+    snapshot: Optional[Dict[str, int]] = None,
+    chunk_size: int = 0,
+    chunk_workers: int = CHUNK_WORKERS,
+    stream_parse: bool = False,
+    pool_size: int = 0,
+    http_stats: Optional[HttpStats] = None
+) -> List[Dict]:
+    """
+    Event-loop version of scrape_ord_advanced.
+
+    Each in-flight dataset is a coroutine rather than a blocked thread, so
+    `concurrency` can be raised into the hundreds at the cost of one thread.
+    """
+    concurrency = max(1, concurrency)
+    scheduler = PollScheduler()
+    collector = MemoryWriter() if writer is None else None
+    emitter = DatasetEmitter(writer or collector, ordered, checkpoint)
+
+    with DecodeStage(workers=decode_workers, ordered=ordered) as decoder:
+        async with AsyncORDClient(
+            pool_size=pool_size or pool_size_for(concurrency, chunk_size, chunk_workers),
+            limiter=RateLimiter(rate, burst),
+            stats=http_stats
+        ) as client:
+            print("Fetching list of all datasets...", file=sys.stderr)
+            datasets = select_datasets(await client.get_datasets(cache), dataset_ids, snapshot, checkpoint)
+            window = DatasetWindow(datasets, concurrency, max_datasets, emitter, snapshot)
+
+            def start(ds: Dict) -> asyncio.Task:
+                return asyncio.ensure_future(process_dataset_async(
+                    client, ds, per_dataset_limit, scheduler, poll_timeout, poll_resumes,
+                    decoder, checkpoint, cache, chunk_size, chunk_workers, stream_parse
+                ))
+
+            while window.refill(start):
+                done, _ = await asyncio.wait(window.pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    window.finish(task)
+
+    return collector.rows if collector else []
 
 
 
@@ -230,6 +2204,37 @@ Examples:
   # Scrape 3 datasets with 10 reactions each
   python ord_advanced_scraper.py --max_datasets 3 --limit 10
   
+  # Keep 8 datasets in flight, at most 4 API requests per second
+  python ord_advanced_scraper.py --max_datasets 0 --concurrency 8 --rate 4
+
+  # Poll 200 datasets at once from a single asyncio event loop
+  python ord_advanced_scraper.py --max_datasets 0 --engine async --concurrency 200
+
+  # Size the connection pool explicitly and report keep-alive reuse per endpoint
+  python ord_advanced_scraper.py --max_datasets 0 --concurrency 16 --pool_size 32 --http_stats http_stats.json
+
+  # Stream every dataset to JSON Lines, then also build the pretty JSON array
+  python ord_advanced_scraper.py --max_datasets 0 --output_format jsonl --pretty_json
+
+  # Also write analytics-friendly Parquet tables (reactions + exploded components)
+  python ord_advanced_scraper.py --max_datasets 0 --output_format jsonl --parquet_dir ord_parquet
+
+  # Keep an indexed SQLite store for component lookups and cross-run dedupe
+  python ord_advanced_scraper.py --max_datasets 0 --output_format jsonl --sqlite_db reactions.db
+
+  # Checkpoint progress, then pick up where a crashed run left off
+  python ord_advanced_scraper.py --max_datasets 0 --output_format jsonl --checkpoint ord_state.db
+  python ord_advanced_scraper.py --max_datasets 0 --output_format jsonl --checkpoint ord_state.db --resume
+
+  # Daily incremental run: unchanged datasets are served from the local cache
+  python ord_advanced_scraper.py --max_datasets 0 --limit 0 --cache_dir ~/.cache/ord_scraper
+
+  # Nightly delta: only query datasets added or grown since the stored snapshot
+  python ord_advanced_scraper.py --max_datasets 0 --limit 0 --output_format jsonl --since-snapshot ord_snapshot.json
+
+  # Pull huge datasets as parallel windows of 5000 reactions
+  python ord_advanced_scraper.py --max_datasets 0 --limit 0 --chunk_size 5000 --chunk_workers 4
+
   # Scrape a specific dataset (all reactions)
   python ord_advanced_scraper.py --dataset_ids ord_dataset-3b7692e9d29b43179261358b13997fef --limit 0
         """
@@ -259,8 +2264,156 @@ Examples:
         default=os.path.join(os.getcwd(), "ord_scrape_results.json"),
         help="Output JSON file path (default: ord_scrape_results.json)"
     )
+    parser.add_argument(
+        "--output_format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="json: pretty array written at the end; jsonl: stream records as each dataset completes (default: json)."
+    )
+    parser.add_argument(
+        "--jsonl_out",
+        default=os.path.join(os.getcwd(), "ord_scrape_results.jsonl"),
+        help="Output JSON Lines file path for --output_format jsonl (default: ord_scrape_results.jsonl)"
+    )
+    parser.add_argument(
+        "--pretty_json",
+        action="store_true",
+        help="With --output_format jsonl, also convert the finished stream into the pretty --json_out array."
+    )
+    parser.add_argument(
+        "--parquet_dir",
+        default=None,
+        help="Also export columnar Parquet tables (reactions/, components/) into this directory; requires pyarrow. "
+             "With --checkpoint, each dataset gets its own part file so --resume stays consistent."
+    )
+    parser.add_argument(
+        "--sqlite_db",
+        default=None,
+        help="Also store reactions, components and provenance in this SQLite file (schema shared with the KMT scraper)."
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="SQLite file recording completed datasets, in-flight task_ids and output offsets (requires --output_format jsonl)."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from --checkpoint: skip completed datasets and re-attach to pending task_ids."
+    )
+    parser.add_argument(
+        "--cache_dir",
+        default=None,
+        help="Directory for the on-disk API response cache (default: no cache)."
+    )
+    parser.add_argument(
+        "--cache_ttl_days",
+        type=float,
+        default=CACHE_TTL_S / 86400,
+        help=f"Days a cached query result stays valid if its dataset is unchanged (default: {CACHE_TTL_S // 86400})."
+    )
+    parser.add_argument(
+        "--cache_max_mb",
+        type=int,
+        default=CACHE_MAX_BYTES // 1024 ** 2,
+        help=f"Size bound for the cache; least recently used entries are evicted (default: {CACHE_MAX_BYTES // 1024 ** 2})."
+    )
+    parser.add_argument(
+        "--since_snapshot", "--since-snapshot",
+        dest="since_snapshot",
+        default=None,
+        help="Delta mode: JSON snapshot of the last listing. Only new or grown datasets are queried, results are "
+             "merged into the existing output (deduplicated by reaction_id) and the snapshot is updated. "
+             "Combine with --limit 0 so grown datasets are fetched in full."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of datasets kept in flight simultaneously (default: 1)."
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "async"],
+        default="threads",
+        help="Concurrency engine: a thread per in-flight dataset, or one asyncio event loop (default: threads)."
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=2.0,
+        help="Global politeness limit in API requests per second (default: 2.0). Use 0 to disable."
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=1,
+        help="Requests allowed back to back before --rate applies (token bucket size, default: 1)."
+    )
+    parser.add_argument(
+        "--pool_size",
+        type=int,
+        default=0,
+        help="Keep-alive HTTP connections to pool (default: 0 = concurrency x chunk_workers, at least 10)."
+    )
+    parser.add_argument(
+        "--http_stats",
+        nargs="?",
+        const="",
+        default=None,
+        help="Report per-endpoint connection reuse, TTFB, bytes and retries at the end; optionally also save them as JSON to this path."
+    )
+    parser.add_argument(
+        "--poll_timeout",
+        type=float,
+        default=REACTION_TIMEOUT_S,
+        help=f"Seconds to poll a query task before timing out (default: {REACTION_TIMEOUT_S})."
+    )
+    parser.add_argument(
+        "--poll_resumes",
+        type=int,
+        default=POLL_RESUMES,
+        help=f"Times to resume polling a timed-out task_id before giving up (default: {POLL_RESUMES})."
+    )
+    parser.add_argument(
+        "--decode_workers",
+        type=int,
+        default=0,
+        help="Processes for protobuf decoding/extraction (default: 0, decode on the fetching thread)."
+    )
+    parser.add_argument(
+        "--chunk_size",
+        type=int,
+        default=0,
+        help="Fetch datasets larger than this as parallel offset/limit windows of this size (default: 0, off)."
+    )
+    parser.add_argument(
+        "--chunk_workers",
+        type=int,
+        default=CHUNK_WORKERS,
+        help=f"Chunk windows fetched in parallel per dataset (default: {CHUNK_WORKERS})."
+    )
+    parser.add_argument(
+        "--stream_parse",
+        action="store_true",
+        help="Parse query results item by item off the socket instead of loading whole bodies (bypasses --cache_dir writes)."
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Emit rows in completion order instead of dataset order."
+    )
+    parser.add_argument(
+        "--category_rules",
+        default=None,
+        help="JSON file of ordered {category, patterns} rules for grouping components (default: CORE_CATEGORIES)."
+    )
     
     args = parser.parse_args()
+    if args.checkpoint and args.output_format != "jsonl":
+        parser.error("--checkpoint requires --output_format jsonl")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
     
     
     ds_ids: Optional[List[str]] = None
@@ -275,24 +2428,104 @@ Examples:
     print("🤖 Starting Advanced ORD Scraper", file=sys.stderr)
     print(f"Datasets to process: {args.max_datasets or 'ALL'}", file=sys.stderr)
     print(f"Reactions/Dataset: {args.per_dataset_limit or 'ALL'}", file=sys.stderr)
-    print(f"Output File: {args.json_out}", file=sys.stderr)
+    print(f"Engine: {args.engine} | Concurrency: {args.concurrency} | Rate limit: {args.rate or 'OFF'} req/s", file=sys.stderr)
+    print(f"Output File: {args.jsonl_out if args.output_format == 'jsonl' else args.json_out}", file=sys.stderr)
     print("="*50 + "\n", file=sys.stderr)
     
     try:
-        rows = scrape_ord_advanced(
+        if args.category_rules:
+            set_category_rules(CategoryClassifier.from_file(args.category_rules).rules)
+        checkpoint = ScrapeCheckpoint(args.checkpoint) if args.checkpoint else None
+        cache = None
+        if args.cache_dir:
+            cache = ResponseCache(args.cache_dir, ttl=args.cache_ttl_days * 86400, max_bytes=args.cache_max_mb * 1024 ** 2)
+        snapshot = load_snapshot(args.since_snapshot) if args.since_snapshot else None
+        if checkpoint and not args.resume:
+            appends = snapshot is not None and os.path.exists(args.jsonl_out)
+            checkpoint.reset(base_offset=os.path.getsize(args.jsonl_out) if appends else 0)
+        
+        out_path = args.jsonl_out if args.output_format == "jsonl" else args.json_out
+        existing_rows: List[Dict] = []
+        
+        if args.output_format == "jsonl":
+            writer = JsonlWriter(
+                args.jsonl_out,
+                resume_offset=checkpoint.output_offset() if args.resume else None,
+                append=snapshot is not None
+            )
+        else:
+            writer = MemoryWriter()
+            if snapshot is not None:
+                existing_rows = load_records(args.json_out)
+        sinks = [writer]
+        if args.parquet_dir:
+            sinks.append(ParquetExport(args.parquet_dir, run_id=checkpoint.run_id() if checkpoint else None))
+        if args.sqlite_db:
+            sinks.append(ReactionStore(args.sqlite_db))
+        if len(sinks) > 1:
+            writer = TeeWriter(sinks)
+        if snapshot is not None:
+            known_ids = {r["reaction_id"] for r in existing_rows if r.get("reaction_id")} if existing_rows else load_reaction_ids(out_path)
+            writer = MergingWriter(writer, known_ids)
+        http_stats = HttpStats() if args.http_stats is not None else None
+        scrape_kwargs = dict(
             max_datasets=args.max_datasets,
             per_dataset_limit=args.per_dataset_limit,
-            dataset_ids=ds_ids
+            dataset_ids=ds_ids,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            burst=args.burst,
+            poll_timeout=args.poll_timeout,
+            poll_resumes=args.poll_resumes,
+            decode_workers=args.decode_workers,
+            ordered=not args.unordered,
+            writer=writer,
+            checkpoint=checkpoint,
+            cache=cache,
+            snapshot=snapshot,
+            chunk_size=args.chunk_size,
+            chunk_workers=args.chunk_workers,
+            stream_parse=args.stream_parse,
+            pool_size=args.pool_size,
+            http_stats=http_stats
         )
+        try:
+            if args.engine == "async":
+                asyncio.run(scrape_ord_async(**scrape_kwargs))
+            else:
+                scrape_ord_advanced(**scrape_kwargs)
+        finally:
+            writer.close()
+            if checkpoint:
+                checkpoint.close()
+            if cache:
+                cache.close()
         
-        
-        with open(args.json_out, "w", encoding="utf-8") as f:
-            json.dump(rows, f, ensure_ascii=False, indent=2)
+        saved_to = [args.json_out]
+        if args.output_format == "jsonl":
+            saved_to = [args.jsonl_out]
+            if args.pretty_json:
+                jsonl_to_json_array(args.jsonl_out, args.json_out)
+                saved_to.append(args.json_out)
+        else:
+            with open(args.json_out, "w", encoding="utf-8") as f:
+                json.dump(existing_rows + writer.rows, f, ensure_ascii=False, indent=2)
+        if args.parquet_dir:
+            saved_to.append(args.parquet_dir)
+        if args.sqlite_db:
+            saved_to.append(args.sqlite_db)
+        if snapshot is not None:
+            save_snapshot(args.since_snapshot, snapshot)
+            saved_to.append(args.since_snapshot)
             
         print("\n" + "="*50, file=sys.stderr)
-        print(f" Scrape Complete! Total reactions processed: {len(rows)}", file=sys.stderr)
-        print(f"File saved to: {args.json_out}", file=sys.stderr)
+        print(f" Scrape Complete! Total reactions processed: {writer.count}", file=sys.stderr)
+        print(f"File saved to: {', '.join(saved_to)}", file=sys.stderr)
         print("="*50 + "\n", file=sys.stderr)
+        if http_stats:
+            http_stats.report()
+            if args.http_stats:
+                http_stats.save(args.http_stats)
         
     except Exception as e:
         print(f"\n CRITICAL FAILURE: {e}", file=sys.stderr)
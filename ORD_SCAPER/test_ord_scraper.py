@@ -0,0 +1,139 @@
+"""
+Regression tests for ord_scraper.py.py.
+
+    python -m pytest test_ord_scraper.py
+"""
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import pytest
+
+
+def load_scraper():
+    """Imports ord_scraper.py.py, whose double extension defeats a plain import."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ord_scraper.py.py")
+    spec = importlib.util.spec_from_file_location("ord_scraper", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+ord_scraper = load_scraper()
+
+
+def run_main(monkeypatch, argv, scrape):
+    monkeypatch.setattr(sys, "argv", ["ord_scraper.py.py"] + argv)
+    monkeypatch.setattr(ord_scraper, "scrape_ord_advanced", scrape)
+    ord_scraper.main()
+
+
+def test_delta_resume_keeps_earlier_output(tmp_path, monkeypatch):
+    out = tmp_path / "ord.jsonl"
+    previous = [{"dataset_id": "ord_dataset-old", "reaction_id": f"ord-{i}"} for i in range(3)]
+    out.write_text("".join(json.dumps(row) + "\n" for row in previous), encoding="utf-8")
+    snapshot = tmp_path / "snapshot.json"
+    snapshot.write_text(json.dumps({"ord_dataset-old": 3}), encoding="utf-8")
+    argv = [
+        "--output_format", "jsonl", "--jsonl_out", str(out),
+        "--checkpoint", str(tmp_path / "state.db"), "--since_snapshot", str(snapshot),
+    ]
+
+    def crash(**kwargs):
+        raise RuntimeError("killed before the first dataset was written")
+
+    with pytest.raises(SystemExit):
+        run_main(monkeypatch, argv, crash)
+    assert out.stat().st_size > 0
+
+    def finish(writer, checkpoint, **kwargs):
+        writer.write_dataset("ord_dataset-new", [{"dataset_id": "ord_dataset-new", "reaction_id": "ord-new"}])
+        checkpoint.mark_written("ord_dataset-new", True, os.path.getsize(out))
+
+    run_main(monkeypatch, argv + ["--resume"], finish)
+    ids = [json.loads(line)["reaction_id"] for line in out.read_text(encoding="utf-8").splitlines()]
+    assert ids == ["ord-0", "ord-1", "ord-2", "ord-new"]
+
+
+class OffsetIgnoringServer:
+    """Answers every query from reaction 0, whatever its offset; the short tail window finishes first."""
+
+    def __init__(self, total: int, chunk_size: int):
+        self.total = total
+        self.chunk_size = chunk_size
+        self.tail_done = threading.Event()
+
+    def submit_query(self, session, dataset_id, limit, limiter=None, offset=0):
+        return str(limit)
+
+    def results(self, limit: int) -> List[Dict]:
+        if limit == self.chunk_size:
+            self.tail_done.wait(5)
+            time.sleep(0.05)
+        rows = [{"proto": f"reaction-{i}"} for i in range(limit)]
+        if limit < self.chunk_size:
+            self.tail_done.set()
+        return rows
+
+    def poll_task(self, session, dataset_id, task_id, limit, *args, **kwargs):
+        return self.results(int(task_id))
+
+
+@pytest.fixture
+def offset_ignoring_server(monkeypatch):
+    server = OffsetIgnoringServer(total=55, chunk_size=40)
+    monkeypatch.setattr(ord_scraper, "submit_query", server.submit_query)
+    monkeypatch.setattr(ord_scraper, "poll_task", server.poll_task)
+    monkeypatch.setattr(ord_scraper, "decode_items", lambda items, dataset_id: [dict(item) for item in items])
+    return server
+
+
+def test_chunked_fetch_detects_ignored_offset_when_tail_finishes_first(offset_ignoring_server):
+    ds = {"dataset_id": "ord_dataset-big", "num_reactions": offset_ignoring_server.total}
+    rows = ord_scraper.process_dataset(None, ds, 0, chunk_size=offset_ignoring_server.chunk_size, chunk_workers=2)
+    assert [row["proto"] for row in rows] == [f"reaction-{i}" for i in range(55)]
+
+
+def test_async_chunked_fetch_detects_ignored_offset_when_tail_finishes_first(offset_ignoring_server, monkeypatch):
+    server = offset_ignoring_server
+
+    class Client:
+        async def submit_query(self, dataset_id, limit, offset=0):
+            return str(limit)
+
+    async def poll_task_async(client, dataset_id, task_id, limit, *args, **kwargs):
+        return await asyncio.to_thread(server.results, int(task_id))
+
+    monkeypatch.setattr(ord_scraper, "poll_task_async", poll_task_async)
+    ds = {"dataset_id": "ord_dataset-big", "num_reactions": server.total}
+    rows = asyncio.run(ord_scraper.process_dataset_async(Client(), ds, 0, chunk_size=server.chunk_size, chunk_workers=2))
+    assert [row["proto"] for row in rows] == [f"reaction-{i}" for i in range(55)]
+
+
+def test_resume_replaces_failed_dataset(tmp_path, monkeypatch):
+    out = tmp_path / "ord.jsonl"
+    checkpoint = ord_scraper.ScrapeCheckpoint(str(tmp_path / "state.db"))
+    checkpoint.reset()
+    listing = [{"dataset_id": f"ord_dataset-{i}", "num_reactions": 1} for i in range(3)]
+    monkeypatch.setattr(ord_scraper, "get_datasets", lambda session, limiter, cache: listing)
+    failing = {"ord_dataset-1"}
+
+    def process_dataset(session, ds, *args):
+        if ds["dataset_id"] in failing:
+            raise RuntimeError("server error")
+        return [{"dataset_id": ds["dataset_id"], "reaction_id": ds["dataset_id"] + "-rxn"}]
+
+    monkeypatch.setattr(ord_scraper, "process_dataset", process_dataset)
+    for resume in (False, True):
+        writer = ord_scraper.JsonlWriter(str(out), resume_offset=checkpoint.output_offset() if resume else None)
+        ord_scraper.scrape_ord_advanced(None, 0, None, writer=writer, checkpoint=checkpoint)
+        writer.close()
+        failing.clear()
+
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [row["reaction_id"] for row in rows] == ["ord_dataset-0-rxn", "ord_dataset-2-rxn", "ord_dataset-1-rxn"]